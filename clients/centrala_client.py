@@ -1,10 +1,42 @@
+import asyncio
+import hashlib
+import httpx
+import io
 import logging
+import orjson
 import os
 import requests
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from pathlib import Path
+from types import MappingProxyType
+from urllib3.util.retry import Retry
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from .env file, unless the environment already provides them
+if "CENTRALA_API_KEY" not in os.environ:
+    load_dotenv()
+
+# (connect, read) timeouts in seconds, so a stalled socket can't hang a task forever
+REQUEST_TIMEOUT = (5, 30)
+
+# How long cached query endpoint responses stay valid, in seconds
+QUERY_CACHE_TTL = 24 * 60 * 60
+
+# Request bodies are serialized with orjson, so the content type has to be set explicitly
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Sent with every session request. Only encodings urllib3 can decode without extra packages are offered
+SESSION_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+    "User-Agent": "centrala-client/1.0",
+}
+
+# Size of the chunks read from streamed responses, in bytes
+STREAM_CHUNK_SIZE = 64 * 1024
 
 
 class CentralaClient:
@@ -17,6 +49,10 @@ class CentralaClient:
         base_url (str): Base URL of the Centrala API.
         report_url (str): URL of the Centrala reporting endpoint.
         task_identifier (str): Identifier for the task being reported.
+        session (requests.Session): Persistent HTTP session reusing keep-alive connections.
+        cache_dir (Path): Directory holding cached query endpoint responses.
+        cache_ttl (float | None): Lifetime of cached query responses in seconds, None disables caching.
+        state_dir (Path): Directory holding fingerprints of the last accepted answer per task.
     """
 
     def __init__(
@@ -24,6 +60,7 @@ class CentralaClient:
         task_identifier: str,
         base_url: str = "https://c3ntrala.ag3nts.org",
         report_url: str = "https://c3ntrala.ag3nts.org/report",
+        cache_ttl: float | None = QUERY_CACHE_TTL,
     ):
         """
         Initializes the CentralaClient with the given task identifier and URLs.
@@ -32,12 +69,81 @@ class CentralaClient:
             task_identifier (str): Identifier for the task being reported.
             base_url (str, optional): Base URL of the Centrala API.
             report_url (str, optional): URL of the Centrala reporting endpoint. Defaults to the Centrala API URL.
+            cache_ttl (float | None, optional): Lifetime of cached query responses in seconds.
+                Pass None to always hit the API.
         """
         self.logger = logging.getLogger("CentralaClient")
         self.api_key: str = self._get_api_key()
         self.base_url = base_url.rstrip("/")  # Remove trailing slash if present
         self.report_url = report_url
         self.task_identifier = task_identifier
+        # Invariant part of every request payload, built once
+        self._base_payload = MappingProxyType({"task": task_identifier, "apikey": self.api_key})
+        self.session = self._create_session()
+        self.cache_dir = Path(os.environ.get("CENTRALA_CACHE", ".centrala_cache"))
+        self.cache_ttl = cache_ttl
+        self.state_dir = Path(os.environ.get("CENTRALA_STATE", ".centrala_state"))
+        # Serialized responses by cache key, with the time they were stored
+        self._memory_cache: dict[str, tuple[float, bytes]] = {}
+        self._async_client: httpx.AsyncClient | None = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes the underlying HTTP session and its pooled connections."""
+        self.session.close()
+
+    async def aclose(self):
+        """Closes the asynchronous HTTP client, if it was created."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """
+        HTTP/2 client with connection pooling used by the asynchronous query methods.
+
+        Created lazily, so synchronous-only callers never open it. It is bound to the
+        event loop it is first used in - call `aclose()` before that loop ends.
+        """
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=True,
+                timeout=httpx.Timeout(REQUEST_TIMEOUT[1], connect=REQUEST_TIMEOUT[0]),
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+        return self._async_client
+
+    def _create_session(self) -> requests.Session:
+        """
+        Creates a requests session with a pooled, retrying HTTPS adapter.
+
+        POSTs are retried with exponential backoff on timeouts, rate limits and
+        transient server errors, so a flaky final submission doesn't force
+        re-running the whole answer-generation pipeline.
+
+        Returns:
+            requests.Session: Session reused by all calls made by this client.
+        """
+        session = requests.Session()
+        session.headers.update(SESSION_HEADERS)
+        retries = Retry(
+            total=5,
+            backoff_factor=1.0,
+            status_forcelist=(408, 425, 429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["POST"]),
+            raise_on_status=False,
+        )
+        session.mount(
+            "https://", HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=retries)
+        )
+        return session
 
     def _get_api_key(self) -> str:
         api_key = os.environ.get("CENTRALA_API_KEY")
@@ -45,6 +151,121 @@ class CentralaClient:
             raise Exception("API key for Centrala is missing. Add the key to env.")
         return api_key
 
+    def _cache_key(self, endpoint: str, query: str) -> str:
+        """
+        Builds the cache key of a query endpoint request.
+
+        Args:
+            endpoint (str): The queried endpoint.
+            query (str): The query string.
+
+        Returns:
+            str: Hex digest identifying the request.
+        """
+        raw_key = f"{self.api_key}|{self.task_identifier}|{endpoint}|{query}"
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    def _read_cache(self, key: str) -> dict | None:
+        """
+        Returns a cached response if it exists and has not expired.
+
+        Responses are kept serialized and parsed on every read, so callers get their own
+        copy and cannot change the cached one.
+
+        Args:
+            key (str): Cache key of the request.
+
+        Returns:
+            dict | None: The cached response, or None on a cache miss.
+        """
+        if (entry := self._memory_cache.get(key)) is not None:
+            stored_at, raw = entry
+            if time.time() - stored_at < self.cache_ttl:
+                return orjson.loads(raw)
+            del self._memory_cache[key]
+            return None
+
+        cache_path = self.cache_dir / f"{key}.json"
+        try:
+            stored_at = cache_path.stat().st_mtime
+            if time.time() - stored_at >= self.cache_ttl:
+                return None
+            raw = cache_path.read_bytes()
+            data = orjson.loads(raw)
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            self.logger.warning("Ignoring corrupted cache entry %s: %s", cache_path, e)
+            return None
+
+        self._memory_cache[key] = (stored_at, raw)
+        return data
+
+    def _write_cache(self, key: str, data: dict):
+        """
+        Stores a response in the in-memory and on-disk caches.
+
+        Args:
+            key (str): Cache key of the request.
+            data (dict): The response to cache.
+        """
+        raw = orjson.dumps(data)
+        self._memory_cache[key] = (time.time(), raw)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write a uniquely named temporary file and swap it in, so concurrent writers and
+        # crashes never leave an interleaved or truncated cache entry
+        with tempfile.NamedTemporaryFile(
+            dir=self.cache_dir, prefix=f".{key}.", suffix=".tmp", delete=False
+        ) as tmp_file:
+            tmp_file.write(raw)
+        os.replace(tmp_file.name, self.cache_dir / f"{key}.json")
+
+    def _submission_fingerprint(self, payload: dict) -> str:
+        """
+        Hashes a report payload independently of its key order.
+
+        Args:
+            payload (dict): The payload sent to the report endpoint.
+
+        Returns:
+            str: Hex digest identifying the submission.
+        """
+        serialized = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        return hashlib.sha256(serialized).hexdigest()
+
+    def _read_last_submission(self) -> dict | None:
+        """
+        Returns the last accepted submission of this task, if one was recorded.
+
+        Returns:
+            dict | None: Record with the payload fingerprint and the server response.
+        """
+        state_path = self.state_dir / f"{self.task_identifier}.json"
+        try:
+            return orjson.loads(state_path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            self.logger.warning("Ignoring corrupted submission state %s: %s", state_path, e)
+            return None
+
+    def _write_last_submission(self, fingerprint: str, response_data: dict | None):
+        """
+        Records an accepted submission of this task.
+
+        Args:
+            fingerprint (str): Fingerprint of the submitted payload.
+            response_data (dict | None): The parsed server response.
+        """
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        # Write a uniquely named temporary file and swap it in, so concurrent writers and
+        # crashes never leave an interleaved or truncated state file
+        with tempfile.NamedTemporaryFile(
+            dir=self.state_dir, prefix=f".{self.task_identifier}.", suffix=".tmp", delete=False
+        ) as tmp_file:
+            tmp_file.write(orjson.dumps({"sha256": fingerprint, "response": response_data}))
+        os.replace(tmp_file.name, self.state_dir / f"{self.task_identifier}.json")
+
     def _construct_payload(self, answer: str | dict):
         """
         Constructs the payload for the API request.
@@ -55,11 +276,7 @@ class CentralaClient:
         Returns:
             dict: The payload containing the task identifier, API key, and answer.
         """
-        return {
-            "task": self.task_identifier,
-            "apikey": self.api_key,
-            "answer": answer,
-        }
+        return {**self._base_payload, "answer": answer}
 
     def _construct_query_payload(self, query: str):
         """
@@ -71,33 +288,135 @@ class CentralaClient:
         Returns:
             dict: The payload containing the API key and query.
         """
-        return {
-            "task": self.task_identifier,
-            "apikey": self.api_key,
-            "query": query,
-        }
+        return {**self._base_payload, "query": query}
 
-    def send_answer(self, answer: str | dict):
+    def _serialize(self, payload: dict) -> bytes:
+        """
+        Serializes a request payload to JSON bytes.
+
+        Args:
+            payload (dict): The payload to serialize.
+
+        Returns:
+            bytes: UTF-8 encoded JSON body.
+        """
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+
+    def send_answer(self, answer: str | dict | list, force: bool = False) -> dict | None:
         """
         Sends the answer to the Centrala API.
 
+        An answer identical to the last one the API accepted for this task is not
+        sent again, unless `force` is set. Use `force` for command-style answers
+        that are meant to be repeated.
+
         Args:
-            answer (str | dict): The answer to be sent to the Centrala API.
+            answer (str | dict | list): The answer to be sent to the Centrala API.
+            force (bool, optional): Send the answer even if it was already accepted.
+
+        Returns:
+            dict | None: The parsed JSON response, or None if the response is not JSON.
+                For a skipped duplicate, the response recorded for the accepted submission.
 
         Logs:
             Info: Logs the status code and content of the API response.
         """
+        payload = self._construct_payload(answer)
+        fingerprint = self._submission_fingerprint(payload)
+
+        if not force:
+            last_submission = self._read_last_submission()
+            if last_submission and last_submission.get("sha256") == fingerprint:
+                self.logger.warning(
+                    "Duplicate submission skipped, answer was already accepted for task %s",
+                    self.task_identifier,
+                )
+                return last_submission.get("response")
+
+        response_data, accepted = self._post_answer(payload)
+        if accepted:
+            self._write_last_submission(fingerprint, response_data)
+
+        return response_data
+
+    def _post_answer(self, payload: dict) -> tuple[dict | None, bool]:
+        """
+        Posts a payload to the report endpoint and logs the response.
+
+        Args:
+            payload (dict): The payload to send.
+
+        Returns:
+            tuple[dict | None, bool]: The parsed JSON response, or None if the response is
+                not JSON, and whether the API accepted the submission.
+        """
         self.logger.info("Sending answer to Centrala...")
 
-        response = requests.post(url=self.report_url, json=self._construct_payload(answer))
+        response = self.session.post(
+            url=self.report_url,
+            data=self._serialize(payload),
+            headers=JSON_HEADERS,
+            timeout=REQUEST_TIMEOUT,
+        )
+
+        self.logger.info("Response status code: %s", response.status_code)
+
+        # Parse the body once straight from the raw bytes instead of decoding it for the log first
+        try:
+            response_data = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            self.logger.info("Response content: %s", response.text)
+            response_data = None
+        else:
+            self.logger.info("Response content: %s", response_data)
 
-        self.logger.info(f"Response status code: {response.status_code}")
-        self.logger.info(f"Response content: {response.content.decode('utf-8')}")
+        return response_data, response.ok
+
+    def send_answers_batch(self, answers: list) -> dict | None:
+        """
+        Sends several answers to the Centrala API in a single request.
+
+        Only usable for tasks whose report endpoint accepts a list as the answer.
+
+        Args:
+            answers (list): The answers to be sent together.
+
+        Returns:
+            dict | None: The parsed JSON response, or None if the response is not JSON.
+        """
+        return self.send_answer(list(answers))
+
+    def send_answers_concurrent(self, answers: list, max_workers: int = 8) -> list[dict | None]:
+        """
+        Sends each answer as a separate request, running the requests in parallel.
+
+        For tasks that expect one answer per request. All requests share the
+        client's session and its connection pool. The answers are always sent and
+        not recorded as the task's last submission, since there is no single last
+        answer among requests finishing in any order.
+
+        Args:
+            answers (list): The answers to be sent.
+            max_workers (int, optional): Maximum number of requests in flight at once.
+
+        Returns:
+            list[dict | None]: The parsed responses, in the same order as the answers.
+        """
+
+        def send(answer) -> dict | None:
+            response_data, _ = self._post_answer(self._construct_payload(answer))
+            return response_data
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(send, answers))
 
     def query_endpoint(self, endpoint: str, query: str) -> dict:
         """
         Queries a Centrala endpoint with the given query string.
 
+        Query endpoints are informational, so responses are cached on disk and
+        repeated queries are served from the cache until they expire.
+
         Args:
             endpoint (str): The endpoint to query (e.g., 'people', 'places', 'apidb').
             query (str): The query string to send.
@@ -109,29 +428,150 @@ class CentralaClient:
             requests.RequestException: If the request fails.
             ValueError: If the response is not valid JSON.
         """
+        cache_key = None
+        if self.cache_ttl is not None:
+            cache_key = self._cache_key(endpoint, query)
+            if (cached_data := self._read_cache(cache_key)) is not None:
+                self.logger.info("Using cached %s response for query: %s", endpoint, query)
+                return cached_data
+
         url = f"{self.base_url}/{endpoint}"
         payload = self._construct_query_payload(query)
 
-        self.logger.info(f"Querying {endpoint} endpoint with query: {query}, payload: {payload}")
+        self.logger.info("Querying %s endpoint with query: %s", endpoint, query)
+        self.logger.debug("Query payload: %s", payload)
 
         try:
-            response = requests.post(url=url, json=payload)
+            response = self.session.post(
+                url=url, data=self._serialize(payload), headers=JSON_HEADERS, timeout=REQUEST_TIMEOUT
+            )
             response.raise_for_status()  # Raise an exception for bad status codes
 
-            self.logger.info(f"Response status code: {response.status_code}")
+            self.logger.info("Response status code: %s", response.status_code)
+
+            response_data = orjson.loads(response.content)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Response data: %s", response_data)
 
-            response_data = response.json()
-            self.logger.info(f"Response data: {response_data}")
+            if cache_key:
+                self._write_cache(cache_key, response_data)
 
             return response_data
 
         except requests.RequestException as e:
-            self.logger.error(f"Request failed for {endpoint} endpoint: {e}")
+            self.logger.error("Request failed for %s endpoint: %s", endpoint, e)
             raise
         except ValueError as e:
-            self.logger.error(f"Invalid JSON response from {endpoint} endpoint: {e}")
+            self.logger.error("Invalid JSON response from %s endpoint: %s", endpoint, e)
             raise
 
+    def query_endpoint_stream(self, endpoint: str, query: str) -> dict:
+        """
+        Queries a Centrala endpoint, reading a large response body in chunks.
+
+        The compressed body is decompressed chunk by chunk as it arrives instead of
+        being buffered whole first. Responses are not cached.
+
+        Args:
+            endpoint (str): The endpoint to query (e.g., 'people', 'places', 'apidb').
+            query (str): The query string to send.
+
+        Returns:
+            dict: The JSON response from the API.
+
+        Raises:
+            requests.RequestException: If the request fails.
+            ValueError: If the response is not valid JSON.
+        """
+        self.logger.info("Streaming %s endpoint response for query: %s", endpoint, query)
+
+        try:
+            with self.session.post(
+                url=f"{self.base_url}/{endpoint}",
+                data=self._serialize(self._construct_query_payload(query)),
+                headers=JSON_HEADERS,
+                timeout=REQUEST_TIMEOUT,
+                stream=True,
+            ) as response:
+                response.raise_for_status()
+
+                buffer = io.BytesIO()
+                for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                    buffer.write(chunk)
+
+            self.logger.info("Received %d bytes from %s endpoint", buffer.tell(), endpoint)
+            return orjson.loads(buffer.getbuffer())
+
+        except requests.RequestException as e:
+            self.logger.error("Request failed for %s endpoint: %s", endpoint, e)
+            raise
+        except ValueError as e:
+            self.logger.error("Invalid JSON response from %s endpoint: %s", endpoint, e)
+            raise
+
+    async def aquery_endpoint(self, endpoint: str, query: str) -> dict:
+        """
+        Asynchronously queries a Centrala endpoint with the given query string.
+
+        Shares the response cache with `query_endpoint`.
+
+        Args:
+            endpoint (str): The endpoint to query (e.g., 'people', 'places', 'apidb').
+            query (str): The query string to send.
+
+        Returns:
+            dict: The JSON response from the API.
+
+        Raises:
+            httpx.HTTPError: If the request fails.
+            ValueError: If the response is not valid JSON.
+        """
+        cache_key = None
+        if self.cache_ttl is not None:
+            cache_key = self._cache_key(endpoint, query)
+            if (cached_data := self._read_cache(cache_key)) is not None:
+                self.logger.info("Using cached %s response for query: %s", endpoint, query)
+                return cached_data
+
+        self.logger.info("Querying %s endpoint asynchronously with query: %s", endpoint, query)
+
+        try:
+            response = await self.async_client.post(
+                f"/{endpoint}",
+                content=self._serialize(self._construct_query_payload(query)),
+                headers=JSON_HEADERS,
+            )
+            response.raise_for_status()
+
+            response_data = orjson.loads(response.content)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Response data: %s", response_data)
+
+            if cache_key:
+                self._write_cache(cache_key, response_data)
+
+            return response_data
+
+        except httpx.HTTPError as e:
+            self.logger.error("Request failed for %s endpoint: %s", endpoint, e)
+            raise
+        except ValueError as e:
+            self.logger.error("Invalid JSON response from %s endpoint: %s", endpoint, e)
+            raise
+
+    async def aquery_many(self, endpoint: str, queries: list[str]) -> list[dict]:
+        """
+        Queries a Centrala endpoint with many query strings concurrently.
+
+        Args:
+            endpoint (str): The endpoint to query (e.g., 'people', 'places', 'apidb').
+            queries (list[str]): The query strings to send.
+
+        Returns:
+            list[dict]: The JSON responses, in the same order as the queries.
+        """
+        return await asyncio.gather(*(self.aquery_endpoint(endpoint, query) for query in queries))
+
     def query_people(self, query: str) -> dict:
         """
         Queries the people endpoint.
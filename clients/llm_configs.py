@@ -1,6 +1,7 @@
 from dataclasses import dataclass
+from functools import lru_cache
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ChatConfig:
     """Configuration for chat completion requests."""
 
@@ -10,16 +11,38 @@ class ChatConfig:
     max_tokens: int = 2000
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AudioConfig:
     """Configuration for audio transcription requests."""
 
     model: str = "whisper-1"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ImageConfig:
     """Configuration for image generation requests."""
 
     model: str = "dall-e-3"
     system_prompt: str = ""
+
+
+# Shared defaults used when a client method is called without a config
+DEFAULT_CHAT_CONFIG = ChatConfig()
+DEFAULT_AUDIO_CONFIG = AudioConfig()
+DEFAULT_IMAGE_CONFIG = ImageConfig()
+
+
+@lru_cache(maxsize=128)
+def system_message(system_prompt: str) -> dict:
+    """
+    Returns the chat message carrying a system prompt, built once per distinct prompt.
+
+    The returned dict is shared between requests and must not be modified.
+
+    Args:
+        system_prompt (str): The system prompt.
+
+    Returns:
+        dict: The system message.
+    """
+    return {"role": "system", "content": system_prompt}
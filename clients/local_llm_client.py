@@ -1,9 +1,76 @@
+import asyncio
 import logging
-import json
+import httpx
+import orjson
 import requests
 import re
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from clients.llm_configs import ChatConfig, AudioConfig, ImageConfig
+from clients.llm_configs import (
+    ChatConfig,
+    AudioConfig,
+    ImageConfig,
+    DEFAULT_CHAT_CONFIG,
+    system_message,
+)
+
+# Maximum number of pooled connections to the local server
+MAX_POOL_CONNECTIONS = 100
+
+# Session shared by all LocalLLMClient instances, returned by _get_shared_session()
+_shared_session: requests.Session | None = None
+
+
+def _get_shared_session() -> requests.Session:
+    """
+    Returns the process-wide session for the local server, creating it on first use.
+
+    Clients created one after another keep reusing the same kept-alive connections
+    instead of each opening their own.
+
+    Returns:
+        requests.Session: Session with a pooled, retrying HTTP adapter.
+    """
+    global _shared_session
+    if _shared_session is None:
+        session = requests.Session()
+        # Every request is a POST, which urllib3 does not retry on a status unless allowed
+        retries = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(["POST"]),
+            raise_on_status=False,
+        )
+        session.mount(
+            "http://",
+            HTTPAdapter(pool_connections=4, pool_maxsize=MAX_POOL_CONNECTIONS, max_retries=retries),
+        )
+        _shared_session = session
+    return _shared_session
+
+
+@lru_cache(maxsize=128)
+def _payload_template(config: ChatConfig, stream: bool) -> dict:
+    """
+    Returns the request payload fields that do not depend on the message, built once per
+    configuration. The returned dict is shared and must be copied before it is modified.
+
+    Args:
+        config (ChatConfig): Configuration for the chat request.
+        stream (bool): Whether to stream the response.
+
+    Returns:
+        dict: The static payload fields.
+    """
+    return {
+        "model": config.model,
+        "temperature": config.temperature,
+        "max_tokens": config.max_tokens,
+        "stream": stream,
+    }
 
 
 class LocalLLMClient:
@@ -11,6 +78,8 @@ class LocalLLMClient:
     A client for interacting with a local LLM server through LM Studio.
     """
 
+    _THINK_RE = re.compile(r"<think>.*?</think>", re.DOTALL)
+
     def __init__(
         self,
         base_url: str = "http://127.0.0.1:1234",
@@ -26,6 +95,46 @@ class LocalLLMClient:
         """
         self.logger = logging.getLogger("LocalLLMClient")
         self.base_url = base_url
+        self.session = _get_shared_session()
+        self._async_client: httpx.AsyncClient | None = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Releases this client. The HTTP session is shared with every other instance, so its
+        pooled connections are left open for them.
+        """
+
+    async def aclose(self):
+        """Closes the asynchronous HTTP client, if it was created."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """Pooled asynchronous HTTP client, created lazily on first use."""
+        if self._async_client is None:
+            self._async_client = self._create_async_client()
+        return self._async_client
+
+    def _create_async_client(self) -> httpx.AsyncClient:
+        """
+        Creates an asynchronous HTTP client for the local server.
+
+        Returns:
+            httpx.AsyncClient: Client with a pool of kept-alive connections.
+        """
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=None,  # Local models can take minutes to answer
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
 
     def _clean_response(self, text: str) -> str:
         """
@@ -37,21 +146,61 @@ class LocalLLMClient:
         Returns:
             str: The cleaned response text.
         """
-        # Use regular expression to remove <think>...</think> blocks
-        cleaned_text = re.sub(r"<think>.*?</think>", "", text, flags=re.DOTALL)
+        # Non-thinking models never emit the tag, so skip the regex entirely
+        if "<think>" not in text:
+            return text.strip()
 
-        # If we removed something, log it
-        if text != cleaned_text:
-            self.logger.debug(f"Original response: {text}")
-            self.logger.info("Removed thinking section from response")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Original response: %s", text)
+        self.logger.info("Removed thinking section from response")
 
-        return cleaned_text.strip()
+        return self._THINK_RE.sub("", text).strip()
+
+    def _build_payload(self, message: str, stream: bool, config: ChatConfig) -> dict:
+        """
+        Builds the chat completions request payload.
+
+        Args:
+            message (str): The user message to send to the API.
+            stream (bool): Whether to stream the response.
+            config (ChatConfig): Configuration for the chat request.
+
+        Returns:
+            dict: The request payload.
+        """
+        return {
+            **_payload_template(config, stream),
+            "messages": [
+                system_message(config.system_prompt),
+                {"role": "user", "content": message},
+            ],
+        }
+
+    def _extract_answer(self, response_data: dict) -> str:
+        """
+        Extracts the cleaned answer from a chat completions response.
+
+        Args:
+            response_data (dict): The parsed API response.
+
+        Returns:
+            str: The answer with any thinking sections removed.
+        """
+        raw_answer = response_data["choices"][0]["message"]["content"]
+
+        # Clean the response to remove thinking sections
+        answer = self._clean_response(raw_answer)
+
+        # Log the received answer
+        self.logger.info("Received answer: %s", answer)
+
+        return answer
 
     def send_message(
         self,
         message: str,
         stream: bool = False,
-        config: ChatConfig = ChatConfig(),
+        config: ChatConfig | None = None,
     ) -> str:
         """
         Sends a message to the local LLM API and retrieves the response.
@@ -67,55 +216,178 @@ class LocalLLMClient:
         Raises:
             Exception: If an error occurs while communicating with the API.
         """
-        # Ensure the message is properly encoded
-        message.encode("utf-8")
+        config = config or DEFAULT_CHAT_CONFIG
 
         try:
             # Prepare the request payload
-            payload = {
-                "model": config.model,
-                "messages": [
-                    {"role": "system", "content": config.system_prompt},
-                    {"role": "user", "content": message},
-                ],
-                "temperature": config.temperature,
-                "max_tokens": config.max_tokens,
-                "stream": stream,
-            }
+            payload = self._build_payload(message, stream, config)
 
             # Send the message to the local LLM API and retrieve the response
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/v1/chat/completions",
                 headers={"Content-Type": "application/json"},
-                data=json.dumps(payload),
+                data=orjson.dumps(payload),
             )
 
             # Raise an exception if the request was unsuccessful
             response.raise_for_status()
 
             # Parse the response
-            response_data = response.json()
-            raw_answer = response_data["choices"][0]["message"]["content"]
-
-            # Clean the response to remove thinking sections
-            answer = self._clean_response(raw_answer)
-
-            # Log the received answer
-            self.logger.info(f"Received answer: {answer}")
-
-            return answer
+            return self._extract_answer(orjson.loads(response.content))
 
         except requests.exceptions.RequestException as e:
             # Log the error and re-raise the exception
-            self.logger.error(f"Error communicating with local LLM API: {e}")
+            self.logger.error("Error communicating with local LLM API: %s", e)
             raise
         except Exception as e:
             # Log the error and re-raise the exception
-            self.logger.error(f"Unexpected error: {e}")
+            self.logger.error("Unexpected error: %s", e)
+            raise
+
+    async def asend_message(self, message: str, config: ChatConfig | None = None) -> str:
+        """
+        Asynchronously sends a message to the local LLM API and retrieves the response.
+
+        Args:
+            message (str): The user message to send to the API.
+            config (ChatConfig, optional): Configuration for the chat request.
+
+        Returns:
+            str: The response from the API with any thinking sections removed.
+
+        Raises:
+            Exception: If an error occurs while communicating with the API.
+        """
+        config = config or DEFAULT_CHAT_CONFIG
+        return await self._acomplete(self.async_client, message, config)
+
+    def send_messages(
+        self, messages: list[str], config: ChatConfig | None = None, max_concurrency: int = 4
+    ) -> list[str]:
+        """
+        Sends several independent messages to the local LLM API concurrently.
+
+        Servers that batch requests (LM Studio, Ollama) answer overlapping requests faster
+        than the same requests sent one after another.
+
+        Args:
+            messages (list[str]): The user messages to send, each as a separate conversation.
+            config (ChatConfig, optional): Configuration shared by all chat requests.
+            max_concurrency (int, optional): Maximum number of requests in flight at once.
+
+        Returns:
+            list[str]: The responses, in the same order as the messages.
+
+        Raises:
+            Exception: If an error occurs while communicating with the API.
+        """
+        config = config or DEFAULT_CHAT_CONFIG
+        return asyncio.run(self._send_messages_async(messages, config, max_concurrency))
+
+    async def _send_messages_async(
+        self, messages: list[str], config: ChatConfig, max_concurrency: int
+    ) -> list[str]:
+        """
+        Runs the concurrent requests of `send_messages` on a short-lived async client.
+
+        A fresh client is used because `asyncio.run` starts a new event loop on every call.
+
+        Args:
+            messages (list[str]): The user messages to send.
+            config (ChatConfig): Configuration shared by all chat requests.
+            max_concurrency (int): Maximum number of requests in flight at once.
+
+        Returns:
+            list[str]: The responses, in the same order as the messages.
+        """
+        async with self._create_async_client() as async_client:
+            return await self._gather_messages(async_client, messages, config, max_concurrency)
+
+    async def asend_messages(
+        self, messages: list[str], config: ChatConfig | None = None, max_concurrency: int = 4
+    ) -> list[str]:
+        """
+        Asynchronously sends several independent messages to the local LLM API concurrently.
+
+        Args:
+            messages (list[str]): The user messages to send, each as a separate conversation.
+            config (ChatConfig, optional): Configuration shared by all chat requests.
+            max_concurrency (int, optional): Maximum number of requests in flight at once.
+
+        Returns:
+            list[str]: The responses, in the same order as the messages.
+
+        Raises:
+            Exception: If an error occurs while communicating with the API.
+        """
+        config = config or DEFAULT_CHAT_CONFIG
+        return await self._gather_messages(self.async_client, messages, config, max_concurrency)
+
+    async def _gather_messages(
+        self,
+        async_client: httpx.AsyncClient,
+        messages: list[str],
+        config: ChatConfig,
+        max_concurrency: int,
+    ) -> list[str]:
+        """
+        Sends messages concurrently through the given async client.
+
+        Args:
+            async_client (httpx.AsyncClient): The client to send the requests with.
+            messages (list[str]): The user messages to send.
+            config (ChatConfig): Configuration shared by all chat requests.
+            max_concurrency (int): Maximum number of requests in flight at once.
+
+        Returns:
+            list[str]: The responses, in the same order as the messages.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def complete(message: str) -> str:
+            async with semaphore:
+                return await self._acomplete(async_client, message, config)
+
+        return await asyncio.gather(*(complete(message) for message in messages))
+
+    async def _acomplete(
+        self, async_client: httpx.AsyncClient, message: str, config: ChatConfig
+    ) -> str:
+        """
+        Sends one chat request through the given async client.
+
+        Args:
+            async_client (httpx.AsyncClient): The client to send the request with.
+            message (str): The user message to send to the API.
+            config (ChatConfig): Configuration for the chat request.
+
+        Returns:
+            str: The response from the API with any thinking sections removed.
+        """
+        try:
+            response = await async_client.post(
+                "/v1/chat/completions",
+                content=orjson.dumps(self._build_payload(message, False, config)),
+                headers={"Content-Type": "application/json"},
+            )
+            response.raise_for_status()
+
+            return self._extract_answer(orjson.loads(response.content))
+
+        except httpx.HTTPError as e:
+            self.logger.error("Error communicating with local LLM API: %s", e)
+            raise
+        except Exception as e:
+            self.logger.error("Unexpected error: %s", e)
             raise
 
     def send_message_with_json_schema(
-        self, message: str, schema_name: str, schema: dict, max_tokens: int = 1000
+        self,
+        message: str,
+        schema_name: str,
+        schema: dict,
+        max_tokens: int = 1000,
+        config: ChatConfig | None = None,
     ) -> dict:
         """
         Sends a message to the local LLM API with a JSON schema for structured responses.
@@ -125,6 +397,7 @@ class LocalLLMClient:
             schema_name (str): The name for the JSON schema.
             schema (dict): The JSON schema definition.
             max_tokens (int): Maximum number of tokens to generate.
+            config (ChatConfig, optional): Configuration for the chat request.
 
         Returns:
             dict: The structured JSON response from the API.
@@ -132,4 +405,32 @@ class LocalLLMClient:
         Raises:
             Exception: If an error occurs while communicating with the API.
         """
-        pass
+        config = config or DEFAULT_CHAT_CONFIG
+
+        try:
+            payload = self._build_payload(message, False, config)
+            payload["max_tokens"] = max_tokens
+            payload["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": schema_name, "strict": True, "schema": schema},
+            }
+
+            response = self.session.post(
+                f"{self.base_url}/v1/chat/completions",
+                headers={"Content-Type": "application/json"},
+                data=orjson.dumps(payload),
+            )
+            response.raise_for_status()
+
+            # The structured answer arrives as JSON text inside the message content
+            return orjson.loads(self._extract_answer(orjson.loads(response.content)))
+
+        except requests.exceptions.RequestException as e:
+            self.logger.error("Error communicating with local LLM API: %s", e)
+            raise
+        except orjson.JSONDecodeError as e:
+            self.logger.error("Response does not match the JSON schema: %s", e)
+            raise
+        except Exception as e:
+            self.logger.error("Unexpected error: %s", e)
+            raise
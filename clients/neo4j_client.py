@@ -1,8 +1,176 @@
+from __future__ import annotations
+
 import logging
 import os
+import re
+
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional
+
+# The neo4j driver is imported when a client is created, so importing this module stays cheap
+if TYPE_CHECKING:
+    from neo4j import Driver, Session
 
-from typing import Any, Optional
-from neo4j import GraphDatabase, Driver, Session
+# Creates relationships of any type in one query, the type is read from each row
+APOC_RELATIONSHIPS_QUERY = """
+UNWIND $relationships AS rel
+MATCH (start:{label} {{userId: rel.start_id}})
+MATCH (end:{label} {{userId: rel.end_id}})
+CALL apoc.create.relationship(start, rel.rel_type, {{}}, end) YIELD rel AS created
+RETURN count(created) AS count
+"""
+
+# Collects all statistics reported by get_database_info in a single round trip
+DATABASE_INFO_QUERY = """
+CALL { MATCH (n) RETURN count(n) AS node_count }
+CALL { MATCH ()-[r]-() RETURN count(r) AS relationship_count }
+CALL { CALL db.labels() YIELD label RETURN collect(label) AS node_labels }
+CALL {
+    CALL db.relationshipTypes() YIELD relationshipType
+    RETURN collect(relationshipType) AS relationship_types
+}
+RETURN node_count, relationship_count, node_labels, relationship_types
+"""
+
+# Records pulled from the server per round trip
+FETCH_SIZE = 10000
+
+# (label, property) pairs looked up by the batch and path helpers, indexed on connect
+DEFAULT_INDEXES = [("User", "userId"), ("User", "username")]
+
+
+# Queries containing any of these clauses run in write transactions
+WRITE_CLAUSE_RE = re.compile(
+    r"\b(CREATE|MERGE|DELETE|SET|REMOVE|DROP|FOREACH|LOAD\s+CSV)\b", re.IGNORECASE
+)
+
+# Names of the procedures called by a query. CALL { ... } subqueries do not match
+PROCEDURE_CALL_RE = re.compile(r"\bCALL\s+([A-Za-z_][\w.]*)", re.IGNORECASE)
+
+# Procedures known to only read. A query calling any other procedure runs in a write
+# transaction, as APOC and db.* procedures can write without any write clause
+READ_PROCEDURE_RE = re.compile(
+    r"db\.(labels|relationshipTypes|propertyKeys|indexes|constraints|schema\.\w+)"
+    r"|apoc\.(meta|path)\.\w+|apoc\.help",
+    re.IGNORECASE,
+)
+
+# Labels, relationship types and property keys are spliced into Cypher text, so they must be
+# plain identifiers - anything else could change the meaning of the query
+IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+def _is_write_query(query: str) -> bool:
+    """Return True unless the query has no write clause and only calls read-only procedures."""
+    if WRITE_CLAUSE_RE.search(query):
+        return True
+    return any(
+        not READ_PROCEDURE_RE.fullmatch(name) for name in PROCEDURE_CALL_RE.findall(query)
+    )
+
+
+def _check_identifiers(*names: str):
+    """Raise ValueError if any name is not safe to splice into a Cypher query."""
+    for name in names:
+        if not IDENTIFIER_RE.fullmatch(name):
+            raise ValueError(f"Invalid Cypher identifier: {name!r}")
+
+
+# Query builders below are memoized on the label and the sorted property keys, so repeated
+# calls skip the string building and validation, and always send byte-identical Cypher that
+# hits the plan cache.
+
+
+@lru_cache(maxsize=256)
+def _property_map(keys: tuple[str, ...], param_prefix: str = "") -> str:
+    _check_identifiers(*keys)
+    return "{" + ", ".join(f"{key}: ${param_prefix}{key}" for key in keys) + "}"
+
+
+@lru_cache(maxsize=256)
+def _where_clause(alias: str, keys: tuple[str, ...], param_prefix: str = "") -> str:
+    _check_identifiers(*keys)
+    return " AND ".join(f"{alias}.{key} = ${param_prefix}{key}" for key in keys)
+
+
+@lru_cache(maxsize=256)
+def _create_node_query(label: str, keys: tuple[str, ...]) -> str:
+    _check_identifiers(label)
+    return f"CREATE (n:{label} {_property_map(keys)}) RETURN n"
+
+
+@lru_cache(maxsize=256)
+def _find_nodes_query(label: str, keys: tuple[str, ...], limit: Optional[int] = None) -> str:
+    _check_identifiers(label)
+    query = f"MATCH (n:{label})"
+    if keys:
+        query += f" WHERE {_where_clause('n', keys)}"
+    query += " RETURN n"
+    if limit is not None:
+        query += f" LIMIT {limit}"
+    return query
+
+
+@lru_cache(maxsize=256)
+def _create_relationship_query(
+    relationship_type: str,
+    start_keys: tuple[str, ...],
+    end_keys: tuple[str, ...],
+    rel_keys: tuple[str, ...],
+) -> str:
+    _check_identifiers(relationship_type)
+    rel_props = _property_map(rel_keys, "rel_") if rel_keys else ""
+    return f"""
+        MATCH (start) WHERE {_where_clause("start", start_keys, "start_")}
+        MATCH (end) WHERE {_where_clause("end", end_keys, "end_")}
+        CREATE (start)-[r:{relationship_type} {rel_props}]->(end)
+        RETURN r
+        """
+
+
+@lru_cache(maxsize=256)
+def _shortest_path_query(
+    start_label: str,
+    start_keys: tuple[str, ...],
+    end_label: str,
+    end_keys: tuple[str, ...],
+    relationship_type: str,
+    max_hops: Optional[int],
+) -> str:
+    _check_identifiers(start_label, end_label)
+
+    # Build relationship pattern - fix syntax for variable length paths
+    hops = f"*..{int(max_hops)}" if max_hops is not None else "*"
+    if relationship_type == "*":
+        rel_pattern = f"[{hops}]"
+    else:
+        _check_identifiers(relationship_type)
+        rel_pattern = f"[:{relationship_type}{hops}]"
+
+    # Inline property maps let the planner seek the (label, property) indexes directly
+    return f"""
+        MATCH (start:{start_label} {_property_map(start_keys, "start_")})
+        MATCH (end:{end_label} {_property_map(end_keys, "end_")})
+        MATCH path = shortestPath((start)-{rel_pattern}-(end))
+        RETURN [node in nodes(path) | node] as path
+        """
+
+
+@lru_cache(maxsize=64)
+def _count_nodes_query(label: Optional[str]) -> str:
+    if label:
+        _check_identifiers(label)
+        return f"MATCH (n:{label}) RETURN count(n) as count"
+    return "MATCH (n) RETURN count(n) as count"
+
+
+@lru_cache(maxsize=64)
+def _count_relationships_query(relationship_type: Optional[str]) -> str:
+    if relationship_type:
+        _check_identifiers(relationship_type)
+        return f"MATCH ()-[r:{relationship_type}]-() RETURN count(r) as count"
+    return "MATCH ()-[r]-() RETURN count(r) as count"
 
 
 class Neo4jClient:
@@ -11,28 +179,43 @@ class Neo4jClient:
     Provides methods for managing nodes, relationships, and running queries.
     """
 
-    def __init__(self):
+    def __init__(self, eager_connect: bool = True):
         """
         Initialize Neo4j client.
 
+        Connection settings are read from the NEO4J_URI, NEO4J_USERNAME,
+        NEO4J_PASSWORD and NEO4J_DATABASE environment variables.
+
         Args:
-            uri: Neo4j server URI (e.g., "bolt://localhost:7687")
-            user: Neo4j username
-            password: Neo4j password
+            eager_connect: Verify the connection and create the default indexes right away.
+                When False, the driver connects on the first query.
         """
+        from neo4j import GraphDatabase
+
         self.logger = logging.getLogger("Neo4jClient")
         self.uri, self.username, self.password = self.read_environment_variables()
-        self.driver: Driver = GraphDatabase.driver(self.uri, auth=(self.username, self.password))
+        self.database = os.getenv("NEO4J_DATABASE", "neo4j")
+        # Bigger record batches mean fewer round trips when pulling large results
+        self.driver: Driver = GraphDatabase.driver(
+            self.uri, auth=(self.username, self.password), fetch_size=FETCH_SIZE
+        )
+        # Query templates whose plan was already logged in debug mode
+        self._profiled_queries: set[str] = set()
+
+        if not eager_connect:
+            return
 
         # Test connection
         try:
-            with self.driver.session() as session:
+            with self.batch() as session:
                 session.run("RETURN 1")
             self.logger.info(f"Successfully connected to Neo4j at {self.uri}")
         except Exception as e:
             self.logger.error(f"Failed to connect to Neo4j: {e}")
             raise
 
+        self.ensure_indexes(DEFAULT_INDEXES)
+
     def read_environment_variables(self):
         # Read username and password from environment variables
         uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
@@ -50,29 +233,104 @@ class Neo4jClient:
             self.driver.close()
             self.logger.info("Neo4j driver connection closed")
 
-    def run_query(self, query: str, parameters: Optional[dict[str, Any]] = None) -> list[dict]:
+    @contextmanager
+    def batch(self, fetch_size: Optional[int] = None) -> Iterator[Session]:
+        """
+        Open one session for a unit of work spanning several queries.
+
+        Pass the yielded session to the query methods so they reuse it
+        instead of opening a session per query.
+
+        Args:
+            fetch_size: Optional records per round trip, overriding the driver default
+
+        Yields:
+            Session bound to the configured database
+        """
+        config = {"fetch_size": fetch_size} if fetch_size is not None else {}
+        with self.driver.session(database=self.database, **config) as session:
+            yield session
+
+    def stream(self, query: str, parameters: Optional[dict[str, Any]] = None) -> Iterator[dict]:
+        """
+        Execute a Cypher query and yield its records one by one.
+
+        Records are pulled from the server in batches as the caller iterates, so
+        large results are never held in memory as a whole. The query runs in an
+        auto-commit transaction, which the driver does not retry.
+
+        Args:
+            query: Cypher query string
+            parameters: Optional parameters for the query
+
+        Yields:
+            Dictionary for each record of the result
+        """
+        with self.batch() as session:
+            for record in session.run(query, parameters or {}):
+                yield record.data()
+
+    def _execute(
+        self, session: Session, work: Callable, query: str, access_mode: Optional[str]
+    ) -> Any:
+        """
+        Run a unit of work in a managed transaction, retried by the driver on transient errors.
+
+        Args:
+            session: Open session to run the transaction in
+            work: Transaction function receiving the transaction and returning its result
+            query: Cypher query string, used to pick the access mode when none is given
+            access_mode: "READ", "WRITE", or None to detect it from the query
+
+        Returns:
+            The value returned by the transaction function
+        """
+        if access_mode is None:
+            access_mode = "WRITE" if _is_write_query(query) else "READ"
+
+        if access_mode == "READ":
+            return session.execute_read(work)
+        return session.execute_write(work)
+
+    def run_query(
+        self,
+        query: str,
+        parameters: Optional[dict[str, Any]] = None,
+        session: Optional[Session] = None,
+        access_mode: Optional[str] = None,
+    ) -> list[dict]:
         """
         Execute a Cypher query and return results.
 
         Args:
             query: Cypher query string
             parameters: Optional parameters for the query
+            session: Optional open session to run the query in, see `batch()`
+            access_mode: "READ" or "WRITE", detected from the query when omitted
 
         Returns:
             List of dictionaries containing query results
         """
+        if session is None:
+            with self.batch() as session:
+                return self.run_query(query, parameters, session, access_mode)
+
         try:
-            with self.driver.session() as session:
-                result = session.run(query, parameters or {})
-                records = [dict(record) for record in result]
-                self.logger.info(f"Query executed successfully, returned {len(records)} records")
-                return records
+            records = self._execute(
+                session, lambda tx: tx.run(query, parameters or {}).data(), query, access_mode
+            )
+            self.logger.info(f"Query executed successfully, returned {len(records)} records")
+            return records
         except Exception as e:
             self.logger.error(f"Failed to execute query: {e}")
             raise
 
     def run_single_query(
-        self, query: str, parameters: Optional[dict[str, Any]] = None
+        self,
+        query: str,
+        parameters: Optional[dict[str, Any]] = None,
+        session: Optional[Session] = None,
+        access_mode: Optional[str] = None,
     ) -> Optional[dict]:
         """
         Execute a Cypher query and return single result.
@@ -80,12 +338,75 @@ class Neo4jClient:
         Args:
             query: Cypher query string
             parameters: Optional parameters for the query
+            session: Optional open session to run the query in, see `batch()`
+            access_mode: "READ" or "WRITE", detected from the query when omitted
 
         Returns:
             Dictionary containing single query result or None
         """
-        results = self.run_query(query, parameters)
-        return results[0] if results else None
+        if session is None:
+            with self.batch() as session:
+                return self.run_single_query(query, parameters, session, access_mode)
+
+        def work(tx):
+            # Only the first record is materialized, the rest is discarded with the result
+            record = tx.run(query, parameters or {}).peek()
+            return record.data() if record else None
+
+        try:
+            return self._execute(session, work, query, access_mode)
+        except Exception as e:
+            self.logger.error(f"Failed to execute query: {e}")
+            raise
+
+    def scalar(
+        self,
+        query: str,
+        parameters: Optional[dict[str, Any]] = None,
+        session: Optional[Session] = None,
+        access_mode: Optional[str] = None,
+    ) -> Any:
+        """
+        Execute a Cypher query and return the first value of its first record.
+
+        Args:
+            query: Cypher query string
+            parameters: Optional parameters for the query
+            session: Optional open session to run the query in, see `batch()`
+            access_mode: "READ" or "WRITE", detected from the query when omitted
+
+        Returns:
+            The value, or None if the query returned no records
+        """
+        if session is None:
+            # A single value is expected, so don't let the server prepare a large batch
+            with self.batch(fetch_size=1) as session:
+                return self.scalar(query, parameters, session, access_mode)
+
+        def work(tx):
+            record = tx.run(query, parameters or {}).peek()
+            return record.value() if record else None
+
+        try:
+            return self._execute(session, work, query, access_mode)
+        except Exception as e:
+            self.logger.error(f"Failed to execute query: {e}")
+            raise
+
+    def ensure_indexes(self, label_property_pairs: list[tuple[str, str]]):
+        """
+        Create range indexes on the given node properties if they don't exist yet.
+
+        Args:
+            label_property_pairs: (label, property) pairs to index, e.g. ("User", "userId")
+        """
+        with self.batch() as session:
+            for label, prop in label_property_pairs:
+                _check_identifiers(label, prop)
+                self.run_query(
+                    f"CREATE INDEX IF NOT EXISTS FOR (n:{label}) ON (n.{prop})", session=session
+                )
+        self.logger.info(f"Ensured indexes on {label_property_pairs}")
 
     def clear_database(self):
         """Remove all nodes and relationships from the database."""
@@ -104,34 +425,40 @@ class Neo4jClient:
         Returns:
             Dictionary containing created node information
         """
-        # Build property string for Cypher query
-        prop_strings = [f"{key}: ${key}" for key in properties.keys()]
-        prop_clause = "{" + ", ".join(prop_strings) + "}"
-
-        query = f"CREATE (n:{label} {prop_clause}) RETURN n"
+        query = _create_node_query(label, tuple(sorted(properties)))
         result = self.run_single_query(query, properties)
 
         self.logger.info(f"Created node with label '{label}' and properties: {properties}")
         return result
 
-    def create_nodes_batch(self, label: str, nodes_data: list[dict[str, Any]]):
+    def create_nodes_batch(
+        self, label: str, nodes_data: list[dict[str, Any]], chunk_size: int = 1000
+    ):
         """
-        Create multiple nodes in a single transaction for better performance.
+        Create multiple nodes in batched transactions for better performance.
+
+        Large imports are split into chunks of `chunk_size` nodes, each committed
+        in its own transaction, so a single huge transaction never builds up.
 
         Args:
             label: Node label for all nodes
             nodes_data: List of dictionaries containing node properties
+            chunk_size: Maximum number of nodes created per transaction
         """
         if not nodes_data:
             return
 
+        _check_identifiers(label)
         query = f"""
         UNWIND $nodes_data AS nodeData
         CREATE (n:{label})
         SET n = nodeData
         """
 
-        self.run_query(query, {"nodes_data": nodes_data})
+        with self.batch() as session:
+            for start in range(0, len(nodes_data), chunk_size):
+                chunk = nodes_data[start : start + chunk_size]
+                self.run_query(query, {"nodes_data": chunk}, session)
         self.logger.info(f"Created {len(nodes_data)} nodes with label '{label}'")
 
     def create_relationship(
@@ -150,77 +477,94 @@ class Neo4jClient:
             relationship_type: Type of relationship (e.g., "KNOWS", "FOLLOWS")
             properties: Optional properties for the relationship
         """
-        # Build WHERE clauses for node matching
-        start_conditions = " AND ".join(
-            [f"start.{key} = $start_{key}" for key in start_node_filter.keys()]
-        )
-        end_conditions = " AND ".join([f"end.{key} = $end_{key}" for key in end_node_filter.keys()])
-
         # Prepare parameters
         params = {}
         for key, value in start_node_filter.items():
             params[f"start_{key}"] = value
         for key, value in end_node_filter.items():
             params[f"end_{key}"] = value
-
-        # Build relationship properties clause
-        rel_props = ""
-        if properties:
-            prop_strings = [f"{key}: $rel_{key}" for key in properties.keys()]
-            rel_props = "{" + ", ".join(prop_strings) + "}"
-            for key, value in properties.items():
-                params[f"rel_{key}"] = value
-
-        query = f"""
-        MATCH (start) WHERE {start_conditions}
-        MATCH (end) WHERE {end_conditions}
-        CREATE (start)-[r:{relationship_type} {rel_props}]->(end)
-        RETURN r
-        """
+        for key, value in (properties or {}).items():
+            params[f"rel_{key}"] = value
+
+        query = _create_relationship_query(
+            relationship_type,
+            tuple(sorted(start_node_filter)),
+            tuple(sorted(end_node_filter)),
+            tuple(sorted(properties or {})),
+        )
 
         self.run_query(query, params)
         self.logger.info(f"Created {relationship_type} relationship")
 
-    def create_relationships_batch(self, relationships_data: list[dict]):
+    def create_relationships_batch(self, relationships_data: list[dict], label: str = "User"):
         """
         Create multiple relationships in a single transaction.
 
+        All relationship types are created by one APOC query. Without APOC
+        installed, falls back to one query per relationship type.
+
         Args:
             relationships_data: List of dictionaries containing:
                 - start_filter: dict to identify start node
                 - end_filter: dict to identify end node
                 - rel_type: relationship type
                 - rel_props: optional relationship properties
+            label: Label of the connected nodes, matched by their indexed userId
         """
+        from neo4j.exceptions import ClientError
+
         if not relationships_data:
             return
 
-        # Process each relationship type separately for efficiency
-        rel_types = set(rel["rel_type"] for rel in relationships_data)
+        _check_identifiers(label)
+
+        # Transform data for query
+        query_data = [
+            {
+                "start_id": rel["start_filter"]["userId"],
+                "end_id": rel["end_filter"]["userId"],
+                "rel_type": rel["rel_type"],
+            }
+            for rel in relationships_data
+        ]
+
+        with self.batch() as session:
+            try:
+                self.run_query(
+                    APOC_RELATIONSHIPS_QUERY.format(label=label),
+                    {"relationships": query_data},
+                    session,
+                )
+            except ClientError as e:
+                self.logger.warning(f"APOC unavailable, creating relationships per type: {e}")
+                self._create_relationships_per_type(query_data, label, session)
 
-        for rel_type in rel_types:
-            typed_rels = [rel for rel in relationships_data if rel["rel_type"] == rel_type]
+        self.logger.info(f"Created {len(relationships_data)} relationships")
+
+    def _create_relationships_per_type(
+        self, query_data: list[dict], label: str, session: Session
+    ):
+        """
+        Create relationships with one query per relationship type.
 
+        Args:
+            query_data: Relationship rows with start_id, end_id and rel_type
+            label: Label of the connected nodes
+            session: Open session to run the queries in
+        """
+        rel_types = set(rel["rel_type"] for rel in query_data)
+
+        for rel_type in rel_types:
+            _check_identifiers(rel_type)
             query = f"""
             UNWIND $relationships AS rel
-            MATCH (start) WHERE start.userId = rel.start_id
-            MATCH (end) WHERE end.userId = rel.end_id
+            MATCH (start:{label} {{userId: rel.start_id}})
+            MATCH (end:{label} {{userId: rel.end_id}})
             CREATE (start)-[:{rel_type}]->(end)
             """
 
-            # Transform data for query
-            query_data = []
-            for rel in typed_rels:
-                query_data.append(
-                    {
-                        "start_id": rel["start_filter"]["userId"],
-                        "end_id": rel["end_filter"]["userId"],
-                    }
-                )
-
-            self.run_query(query, {"relationships": query_data})
-
-        self.logger.info(f"Created {len(relationships_data)} relationships")
+            typed_rels = [rel for rel in query_data if rel["rel_type"] == rel_type]
+            self.run_query(query, {"relationships": typed_rels}, session)
 
     def find_node(self, label: str, properties: dict[str, Any]) -> Optional[dict]:
         """
@@ -233,8 +577,7 @@ class Neo4jClient:
         Returns:
             Dictionary containing node data or None if not found
         """
-        conditions = " AND ".join([f"n.{key} = ${key}" for key in properties.keys()])
-        query = f"MATCH (n:{label}) WHERE {conditions} RETURN n LIMIT 1"
+        query = _find_nodes_query(label, tuple(sorted(properties)), 1)
 
         result = self.run_single_query(query, properties)
         return result["n"] if result else None
@@ -250,12 +593,7 @@ class Neo4jClient:
         Returns:
             List of dictionaries containing node data
         """
-        if properties:
-            conditions = " AND ".join([f"n.{key} = ${key}" for key in properties.keys()])
-            query = f"MATCH (n:{label}) WHERE {conditions} RETURN n"
-        else:
-            query = f"MATCH (n:{label}) RETURN n"
-
+        query = _find_nodes_query(label, tuple(sorted(properties or {})))
         results = self.run_query(query, properties or {})
         return [result["n"] for result in results]
 
@@ -266,25 +604,25 @@ class Neo4jClient:
         end_label: str,
         end_properties: dict[str, Any],
         relationship_type: str = "*",
+        max_hops: Optional[int] = None,
     ) -> Optional[list[dict]]:
         """
         Find shortest path between two nodes.
 
+        With debug logging enabled, the query plan is profiled and logged once per query template.
+
         Args:
             start_label: Label of start node
             start_properties: Properties to identify start node
             end_label: Label of end node
             end_properties: Properties to identify end node
             relationship_type: Type of relationships to traverse (default: any)
+            max_hops: Maximum path length in relationships, None (the default) for unbounded.
+                A path longer than the limit is reported as no path
 
         Returns:
             List of node dictionaries representing the path, or None if no path exists
         """
-        start_conditions = " AND ".join(
-            [f"start.{key} = $start_{key}" for key in start_properties.keys()]
-        )
-        end_conditions = " AND ".join([f"end.{key} = $end_{key}" for key in end_properties.keys()])
-
         # Prepare parameters
         params = {}
         for key, value in start_properties.items():
@@ -292,63 +630,78 @@ class Neo4jClient:
         for key, value in end_properties.items():
             params[f"end_{key}"] = value
 
-        # Build relationship pattern - fix syntax for variable length paths
-        if relationship_type == "*":
-            rel_pattern = "[*]"
-        else:
-            rel_pattern = f"[:{relationship_type}*]"
+        query = _shortest_path_query(
+            start_label,
+            tuple(sorted(start_properties)),
+            end_label,
+            tuple(sorted(end_properties)),
+            relationship_type,
+            max_hops,
+        )
 
-        query = f"""
-        MATCH (start:{start_label}) WHERE {start_conditions}
-        MATCH (end:{end_label}) WHERE {end_conditions}
-        MATCH path = shortestPath((start)-{rel_pattern}-(end))
-        RETURN [node in nodes(path) | node] as path
-        """
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._log_profile(query, params)
 
         result = self.run_single_query(query, params)
 
         if result and result["path"]:
             self.logger.info(f"Found shortest path with {len(result['path'])} nodes")
             return result["path"]
+        elif max_hops is not None:
+            self.logger.warning(
+                "No path of at most %d hops found between specified nodes, "
+                "a longer path may exist",
+                max_hops,
+            )
+            return None
         else:
             self.logger.warning("No path found between specified nodes")
             return None
 
-    def count_nodes(self, label: Optional[str] = None) -> int:
+    def _log_profile(self, query: str, parameters: Optional[dict[str, Any]] = None):
+        """
+        Run a query with PROFILE and log its plan, once per distinct query text.
+
+        Args:
+            query: Cypher query string
+            parameters: Optional parameters for the query
+        """
+        if query in self._profiled_queries:
+            return
+        self._profiled_queries.add(query)
+
+        with self.batch() as session:
+            summary = session.run(f"PROFILE {query}", parameters or {}).consume()
+        self.logger.debug("Query plan for %s: %s", query.strip(), summary.profile)
+
+    def count_nodes(self, label: Optional[str] = None, session: Optional[Session] = None) -> int:
         """
         Count nodes in the database.
 
         Args:
             label: Optional label to filter nodes
+            session: Optional open session to run the query in, see `batch()`
 
         Returns:
             Number of nodes
         """
-        if label:
-            query = f"MATCH (n:{label}) RETURN count(n) as count"
-        else:
-            query = "MATCH (n) RETURN count(n) as count"
+        return self.scalar(_count_nodes_query(label), session=session) or 0
 
-        result = self.run_single_query(query)
-        return result["count"] if result else 0
-
-    def count_relationships(self, relationship_type: Optional[str] = None) -> int:
+    def count_relationships(
+        self, relationship_type: Optional[str] = None, session: Optional[Session] = None
+    ) -> int:
         """
         Count relationships in the database.
 
         Args:
             relationship_type: Optional relationship type to filter
+            session: Optional open session to run the query in, see `batch()`
 
         Returns:
             Number of relationships
         """
-        if relationship_type:
-            query = f"MATCH ()-[r:{relationship_type}]-() RETURN count(r) as count"
-        else:
-            query = "MATCH ()-[r]-() RETURN count(r) as count"
-
-        result = self.run_single_query(query)
-        return result["count"] if result else 0
+        query = _count_relationships_query(relationship_type)
+        return self.scalar(query, session=session) or 0
 
     def get_database_info(self) -> dict[str, Any]:
         """
@@ -357,23 +710,7 @@ class Neo4jClient:
         Returns:
             Dictionary containing database statistics
         """
-        node_count = self.count_nodes()
-        rel_count = self.count_relationships()
-
-        # Get node labels
-        labels_result = self.run_query("CALL db.labels()")
-        labels = [record["label"] for record in labels_result]
-
-        # Get relationship types
-        rel_types_result = self.run_query("CALL db.relationshipTypes()")
-        rel_types = [record["relationshipType"] for record in rel_types_result]
-
-        info = {
-            "node_count": node_count,
-            "relationship_count": rel_count,
-            "node_labels": labels,
-            "relationship_types": rel_types,
-        }
+        info = self.run_single_query(DATABASE_INFO_QUERY)
 
         self.logger.info(f"Database info: {info}")
         return info
@@ -1,8 +1,127 @@
-import base64
+import asyncio
+import hashlib
+import httpx
+import io
 import logging
+import mmap
+import orjson
 import os
-from openai import OpenAI
-from clients.llm_configs import ChatConfig, AudioConfig, ImageConfig
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from pathlib import Path, PurePath
+from typing import Any
+from clients.llm_configs import (
+    ChatConfig,
+    AudioConfig,
+    ImageConfig,
+    DEFAULT_CHAT_CONFIG,
+    DEFAULT_AUDIO_CONFIG,
+    DEFAULT_IMAGE_CONFIG,
+    system_message,
+)
+from utils.rate_limiter import RateLimiter, estimate_tokens
+
+# Bytes encoded per step when building image data URLs. A multiple of 3, so chunks
+# encode without padding and concatenate into one valid base64 string
+BASE64_CHUNK_SIZE = 57 * 1024
+
+# Attempts per asynchronous request, and the first backoff delay in seconds (doubled per retry)
+MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 1.0
+
+# Number of results kept in the in-memory cache of each client
+MEMORY_CACHE_SIZE = 10000
+
+# Deterministic prompts whose word shingles overlap at least this much share a cached answer,
+# when the client is created with fuzzy_cache=True
+FUZZY_MATCH_THRESHOLD = 0.95
+
+# Number of consecutive words in one shingle of a prompt
+SHINGLE_SIZE = 3
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Batch job states after which the job will not change anymore
+BATCH_FINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+# Longest side, in pixels, of images sent for analysis. The API scales larger images down
+# to fit this anyway, so anything above it is upload time spent for nothing
+MAX_IMAGE_SIDE = 2048
+
+# JPEG quality used when re-encoding downscaled images
+DOWNSCALED_JPEG_QUALITY = 85
+
+# Maximum number of inputs the embeddings endpoint accepts in one request
+EMBEDDING_BATCH_SIZE = 2048
+
+# Tokens reserved from the rate limiter for one image, a high-detail 2048px image costs ~1100
+IMAGE_TOKENS_ESTIMATE = 1100
+
+# Image subtypes used in data URLs, by file extension
+IMAGE_FORMATS = {
+    ".jpg": "jpeg",
+    ".jpeg": "jpeg",
+    ".png": "png",
+    ".gif": "gif",
+    ".webp": "webp",
+}
+
+# Shared instance returned by get_client()
+_shared_client = None
+
+
+def _normalize_prompt(text: str, lowercase: bool = True) -> str:
+    """
+    Collapses the whitespace of a prompt, and lowercases it unless told otherwise, so
+    trivial edits map to the same text.
+
+    Args:
+        text (str): The prompt to normalize.
+        lowercase (bool, optional): Whether to lowercase the prompt.
+
+    Returns:
+        str: The normalized prompt.
+    """
+    if lowercase:
+        text = text.lower()
+    return WHITESPACE_RE.sub(" ", text.strip())
+
+
+def _shingles(normalized_text: str) -> frozenset[str]:
+    """
+    Splits a normalized prompt into overlapping runs of SHINGLE_SIZE words.
+
+    Args:
+        normalized_text (str): A prompt returned by _normalize_prompt().
+
+    Returns:
+        frozenset[str]: The distinct shingles of the prompt.
+    """
+    words = normalized_text.split(" ")
+    if len(words) <= SHINGLE_SIZE:
+        return frozenset([normalized_text])
+    return frozenset(
+        " ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)
+    )
+
+
+def get_client() -> "OpenAIClient":
+    """
+    Returns the process-wide OpenAIClient, creating it on first use.
+
+    Call sites that use it share one connection pool instead of each paying
+    for its own TLS handshakes.
+
+    Returns:
+        OpenAIClient: The shared client.
+    """
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = OpenAIClient()
+    return _shared_client
+
 
 class OpenAIClient:
     """
@@ -10,17 +129,109 @@ class OpenAIClient:
     Supports multiple API features with configurable settings.
     """
 
-    def __init__(self, api_key=None):
+    def __init__(
+        self,
+        api_key=None,
+        rate_limiter: RateLimiter | None = None,
+        fuzzy_cache: bool = False,
+    ):
         """
         Initializes the OpenAIClient with the API key.
 
         Args:
             api_key (str, optional): The OpenAI API key. If None, retrieves from environment.
+            rate_limiter (RateLimiter, optional): Throttles requests to the account's request
+                and token limits. If None, they are not throttled.
+            fuzzy_cache (bool, optional): Reuse the answer of a nearly identical earlier
+                deterministic prompt. Off by default, as a prompt differing only in a number
+                or a name would get the other prompt's answer.
         """
         self.logger = logging.getLogger("OpenAIClient")
-        self.client = OpenAI(api_key=api_key or self._get_api_key())
+        self._api_key = api_key or self._get_api_key()
+        self.rate_limiter = rate_limiter
+        self._client = None
+        self._async_client = None
+
+        # Answers to identical requests are reused. They are kept in memory, and also on disk
+        # when OPENAI_CACHE_DIR is set
+        self._memory_cache: OrderedDict[str, Any] = OrderedDict()
+
+        # Answers to deterministic prompts, by model and system prompt, for near-duplicate lookups
+        self.fuzzy_cache = fuzzy_cache
+        self._similar_answers: defaultdict[tuple[str, str], deque] = defaultdict(
+            lambda: deque(maxlen=MEMORY_CACHE_SIZE)
+        )
+        self._similar_answers_lock = threading.Lock()
+        cache_dir = os.environ.get("OPENAI_CACHE_DIR")
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+
+    @property
+    def client(self):
+        """
+        The underlying OpenAI SDK client, created on first use.
+
+        The openai package is only imported here, so tasks that never call the
+        API don't pay for importing it.
+        """
+        if self._client is None:
+            from openai import OpenAI
+
+            self._client = OpenAI(api_key=self._api_key, http_client=self._create_http_client())
+        return self._client
+
+    @property
+    def async_client(self):
+        """
+        The asynchronous OpenAI SDK client, created on first use.
+
+        Its connection pool is bound to the event loop it is first used in -
+        call `aclose()` before that loop ends.
+        """
+        if self._async_client is None:
+            self._async_client = self._create_async_client()
+        return self._async_client
+
+    async def aclose(self):
+        """Closes the asynchronous client, if it was created."""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+
+    def _create_async_client(self):
+        """
+        Creates an AsyncOpenAI client on a pooled HTTP/2 transport.
+
+        Returns:
+            AsyncOpenAI: The new client.
+        """
+        from openai import AsyncOpenAI
+
+        return AsyncOpenAI(
+            api_key=self._api_key,
+            max_retries=0,  # Retries are handled by _acomplete, together with rate limiting
+            http_client=httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=100),
+                timeout=httpx.Timeout(60.0, connect=5.0),
+            ),
+        )
 
-    def send_message(self, message: str, config: ChatConfig = ChatConfig()) -> str:
+    def _create_http_client(self) -> httpx.Client:
+        """
+        Creates the HTTP/2 client with a keep-alive connection pool used by the SDK.
+
+        Returns:
+            httpx.Client: Client reused by all requests made by this instance.
+        """
+        return httpx.Client(
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=32, max_connections=64, keepalive_expiry=60.0
+            ),
+            timeout=httpx.Timeout(60.0, connect=5.0),
+        )
+
+    def send_message(self, message: str, config: ChatConfig | None = None) -> str:
         """
         Sends a message to the OpenAI API and retrieves the response.
 
@@ -34,23 +245,28 @@ class OpenAIClient:
         Raises:
             Exception: If an error occurs while communicating with the API.
         """
-        # Ensure the message is properly encoded
-        message.encode("utf-8")
+        config = config or DEFAULT_CHAT_CONFIG
 
         try:
+            cache_key = self._chat_cache_key(message, config)
+            answer = self._read_cache(cache_key)
+            if answer is None and self.fuzzy_cache and config.temperature == 0:
+                answer = self._find_similar_answer(message, config)
+            if answer is not None:
+                self.logger.info("Using cached answer: %s", answer)
+                return answer
+
             # Send the message to the OpenAI API and retrieve the response
-            response = self.client.chat.completions.create(
-                model=config.model,
-                messages=[
-                    {"role": "system", "content": config.system_prompt},
-                    {"role": "user", "content": message},
-                ],
-                temperature=config.temperature,
+            self._wait_for_capacity(
+                estimate_tokens(config.system_prompt) + estimate_tokens(message) + config.max_tokens
             )
-            answer = response.choices[0].message.content.strip()
+            answer = self._chat(config.system_prompt, message, config.model, config.temperature)
+            self._write_cache(cache_key, answer)
+            if self.fuzzy_cache and config.temperature == 0:
+                self._remember_similar_answer(message, config, answer)
 
             # Log the received answer
-            self.logger.info(f"Received answer: {answer}")
+            self.logger.info("Received answer: %s", answer)
 
             return answer
 
@@ -59,7 +275,486 @@ class OpenAIClient:
             self.logger.error(f"Error communicating with OpenAI API: {e}")
             raise
 
-    def audio_to_text(self, audio_file_path: str, config: AudioConfig = AudioConfig()) -> str:
+    def send_messages(
+        self, messages: list[str], config: ChatConfig | None = None, max_concurrency: int = 8
+    ) -> list[str]:
+        """
+        Sends several independent messages to the OpenAI API concurrently.
+
+        Requests overlap instead of running one after another, so the total time
+        is close to that of the slowest request rather than the sum of all of them.
+
+        Args:
+            messages (list[str]): The user messages to send, each as a separate conversation.
+            config (ChatConfig, optional): Configuration shared by all chat requests.
+            max_concurrency (int, optional): Maximum number of requests in flight at once.
+
+        Returns:
+            list[str]: The responses, in the same order as the messages.
+
+        Raises:
+            Exception: If an error occurs while communicating with the API.
+        """
+        config = config or DEFAULT_CHAT_CONFIG
+        return asyncio.run(self._send_messages_async(messages, config, max_concurrency))
+
+    async def _send_messages_async(
+        self, messages: list[str], config: ChatConfig, max_concurrency: int
+    ) -> list[str]:
+        """
+        Runs the concurrent requests of `send_messages` on a short-lived async client.
+
+        A fresh client is used because `asyncio.run` starts a new event loop on every call.
+
+        Args:
+            messages (list[str]): The user messages to send.
+            config (ChatConfig): Configuration shared by all chat requests.
+            max_concurrency (int): Maximum number of requests in flight at once.
+
+        Returns:
+            list[str]: The responses, in the same order as the messages.
+        """
+        async with self._create_async_client() as async_client:
+            return await self._gather_messages(async_client, messages, config, max_concurrency)
+
+    async def asend_message(self, message: str, config: ChatConfig | None = None) -> str:
+        """
+        Asynchronously sends a message to the OpenAI API and retrieves the response.
+
+        Args:
+            message (str): The user message to send to the API.
+            config (ChatConfig, optional): Configuration for the chat request.
+
+        Returns:
+            str: The response from the API.
+
+        Raises:
+            Exception: If an error occurs while communicating with the API.
+        """
+        config = config or DEFAULT_CHAT_CONFIG
+
+        try:
+            answer = await self._acomplete(self.async_client, message, config)
+        except Exception as e:
+            self.logger.error(f"Error communicating with OpenAI API: {e}")
+            raise
+
+        self.logger.info("Received answer: %s", answer)
+        return answer
+
+    async def asend_messages(
+        self, messages: list[str], config: ChatConfig | None = None, max_concurrency: int = 8
+    ) -> list[str]:
+        """
+        Asynchronously sends several independent messages to the OpenAI API concurrently.
+
+        Args:
+            messages (list[str]): The user messages to send, each as a separate conversation.
+            config (ChatConfig, optional): Configuration shared by all chat requests.
+            max_concurrency (int, optional): Maximum number of requests in flight at once.
+
+        Returns:
+            list[str]: The responses, in the same order as the messages.
+
+        Raises:
+            Exception: If an error occurs while communicating with the API.
+        """
+        config = config or DEFAULT_CHAT_CONFIG
+        return await self._gather_messages(self.async_client, messages, config, max_concurrency)
+
+    async def _gather_messages(
+        self, async_client, messages: list[str], config: ChatConfig, max_concurrency: int
+    ) -> list[str]:
+        """
+        Sends messages concurrently through the given async client.
+
+        Args:
+            async_client (AsyncOpenAI): The client to send the requests with.
+            messages (list[str]): The user messages to send.
+            config (ChatConfig): Configuration shared by all chat requests.
+            max_concurrency (int): Maximum number of requests in flight at once.
+
+        Returns:
+            list[str]: The responses, in the same order as the messages.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def complete(message: str) -> str:
+            async with semaphore:
+                return await self._acomplete(async_client, message, config)
+
+        try:
+            answers = await asyncio.gather(*(complete(message) for message in messages))
+        except Exception as e:
+            self.logger.error(f"Error communicating with OpenAI API: {e}")
+            raise
+
+        self.logger.info("Received %d answers", len(answers))
+        return answers
+
+    async def _acomplete(self, async_client, message: str, config: ChatConfig) -> str:
+        """
+        Sends a single-turn chat request through an async client.
+
+        Waits for rate limiter capacity first, if a limiter is set. Rate limit errors,
+        server errors and connection failures are retried with exponential backoff.
+
+        Args:
+            async_client (AsyncOpenAI): The client to send the request with.
+            message (str): The user message.
+            config (ChatConfig): Configuration for the chat request.
+
+        Returns:
+            str: The response from the API.
+        """
+        from openai import APIConnectionError, APIStatusError
+
+        # Reserve the prompt plus the largest possible completion, like the API's own limiter
+        prompt_tokens = estimate_tokens(config.system_prompt) + estimate_tokens(message)
+        tokens = prompt_tokens + config.max_tokens
+
+        for attempt in range(MAX_ATTEMPTS):
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(tokens)
+
+            try:
+                response = await async_client.chat.completions.create(
+                    model=config.model,
+                    messages=self._build_messages(message, config),
+                    temperature=config.temperature,
+                )
+                return self._extract_content(response)
+            except (APIConnectionError, APIStatusError) as e:
+                retryable = not isinstance(e, APIStatusError) or (
+                    e.status_code == 429 or e.status_code >= 500
+                )
+                if not retryable or attempt == MAX_ATTEMPTS - 1:
+                    raise
+
+                delay = RETRY_BASE_DELAY * 2**attempt
+                self.logger.warning(
+                    "Request failed (%s), retrying in %.1fs (attempt %d/%d)",
+                    e,
+                    delay,
+                    attempt + 1,
+                    MAX_ATTEMPTS,
+                )
+                await asyncio.sleep(delay)
+
+    def submit_batch(self, messages: list[str], config: ChatConfig | None = None) -> str:
+        """
+        Submits messages as an asynchronous Batch API job.
+
+        Batch jobs cost half as much as regular requests, but complete within up to
+        24 hours. Use for bulk work that doesn't need an immediate answer.
+
+        Args:
+            messages (list[str]): The user messages to send, each as a separate conversation.
+            config (ChatConfig, optional): Configuration shared by all chat requests.
+
+        Returns:
+            str: The batch job ID, to be passed to `fetch_batch`.
+
+        Raises:
+            Exception: If the input file upload or the job creation fails.
+        """
+        config = config or DEFAULT_CHAT_CONFIG
+
+        # One request per line, the index is used to restore the order of the results
+        lines = (
+            orjson.dumps(
+                {
+                    "custom_id": str(index),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": config.model,
+                        "messages": self._build_messages(message, config),
+                        "temperature": config.temperature,
+                    },
+                }
+            )
+            for index, message in enumerate(messages)
+        )
+
+        try:
+            input_file = self.client.files.create(
+                file=("batch_input.jsonl", b"\n".join(lines)), purpose="batch"
+            )
+            batch = self.client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+        except Exception as e:
+            self.logger.error(f"Error submitting batch job: {e}")
+            raise
+
+        self.logger.info("Submitted batch job %s with %d requests", batch.id, len(messages))
+        return batch.id
+
+    def fetch_batch(
+        self, batch_id: str, poll_interval: float = 30.0, timeout: float | None = None
+    ) -> list[str | None]:
+        """
+        Waits for a Batch API job to finish and returns its answers.
+
+        Args:
+            batch_id (str): The batch job ID returned by `submit_batch`.
+            poll_interval (float, optional): Seconds between job status checks.
+            timeout (float, optional): Maximum number of seconds to wait. None waits indefinitely.
+
+        Returns:
+            list[str | None]: The answers in the order of the submitted messages, with None
+                for requests that failed.
+
+        Raises:
+            TimeoutError: If the job does not finish within the timeout.
+            Exception: If the job does not complete successfully.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        batch = self.client.batches.retrieve(batch_id)
+        while batch.status not in BATCH_FINAL_STATUSES:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Batch job {batch_id} is still {batch.status}")
+            self.logger.info("Batch job %s is %s, waiting...", batch_id, batch.status)
+            time.sleep(poll_interval)
+            batch = self.client.batches.retrieve(batch_id)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            self.logger.error("Batch job %s ended with status %s", batch_id, batch.status)
+            raise Exception(f"Batch job {batch_id} ended with status {batch.status}")
+
+        answers: list[str | None] = [None] * batch.request_counts.total
+        output = self.client.files.content(batch.output_file_id).content
+        for line in output.splitlines():
+            if not line:
+                continue
+            result = orjson.loads(line)
+            response = result.get("response") or {}
+            if result.get("error") or response.get("status_code") != 200:
+                self.logger.warning(
+                    "Batch request %s failed: %s", result["custom_id"], result.get("error")
+                )
+                continue
+            content = response["body"]["choices"][0]["message"]["content"]
+            answers[int(result["custom_id"])] = (content or "").strip()
+
+        self.logger.info("Fetched %d answers from batch job %s", len(answers), batch_id)
+        return answers
+
+    def _chat(self, system_prompt: str, message: str, model: str, temperature: float) -> str:
+        """
+        Sends a single-turn chat request.
+
+        Args:
+            system_prompt (str): The system prompt.
+            message (str): The user message.
+            model (str): The model to use.
+            temperature (float): The sampling temperature.
+
+        Returns:
+            str: The response from the API.
+        """
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=[system_message(system_prompt), {"role": "user", "content": message}],
+            temperature=temperature,
+        )
+        return self._extract_content(response)
+
+    def _wait_for_capacity(self, tokens: int):
+        """
+        Blocks until the rate limiter, if set, has capacity for a request.
+
+        Args:
+            tokens (int): The number of tokens the request is expected to use.
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait(tokens)
+
+    @staticmethod
+    def _extract_content(response) -> str:
+        """
+        Extracts the stripped text of the first choice of a chat completion.
+
+        Args:
+            response: The chat completion returned by the SDK.
+
+        Returns:
+            str: The response text, or an empty string if the model returned no content.
+        """
+        return (response.choices[0].message.content or "").strip()
+
+    def _file_digest(self, file_path: str) -> str:
+        """
+        Hashes a file's content, reading it through a memory map.
+
+        Args:
+            file_path (str): The path to the file.
+
+        Returns:
+            str: Hex digest of the file content.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        with open(file_path, "rb") as file:
+            # mmap cannot map an empty file
+            if os.fstat(file.fileno()).st_size:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    digest.update(mapped)
+        return digest.hexdigest()
+
+    def _media_cache_key(self, file_path: str, *request_parts) -> str:
+        """
+        Builds the cache key of a request on a media file.
+
+        Args:
+            file_path (str): The path to the processed file.
+            *request_parts: Request settings that affect the result, e.g. the model.
+
+        Returns:
+            str: Hex digest identifying the request.
+        """
+        raw_key = "|".join([self._file_digest(file_path), *map(str, request_parts)])
+        return hashlib.blake2b(raw_key.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _chat_cache_key(self, message: str, config: ChatConfig) -> str:
+        """
+        Builds the cache key of a chat request.
+
+        Deterministic requests (temperature 0) are keyed by the message with its whitespace
+        collapsed, so prompts differing only in whitespace share an answer. Case is only
+        ignored with fuzzy_cache, as it matters for code, passwords, flags and names.
+
+        Args:
+            message (str): The user message.
+            config (ChatConfig): Configuration for the chat request.
+
+        Returns:
+            str: Hex digest identifying the request.
+        """
+        if config.temperature == 0:
+            message = _normalize_prompt(message, lowercase=self.fuzzy_cache)
+        raw_key = f"chat|{config.model}|{config.temperature}|{config.system_prompt}|{message}"
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    def _find_similar_answer(self, message: str, config: ChatConfig) -> str | None:
+        """
+        Returns the answer to a previous prompt whose shingles nearly match the message.
+
+        Args:
+            message (str): The user message.
+            config (ChatConfig): Configuration for the chat request.
+
+        Returns:
+            str | None: The answer of the most similar prompt at or above
+                FUZZY_MATCH_THRESHOLD, or None if there is none.
+        """
+        shingles = _shingles(_normalize_prompt(message))
+        best_answer, best_similarity = None, FUZZY_MATCH_THRESHOLD
+
+        # Scan a snapshot, so other threads can keep remembering answers meanwhile
+        with self._similar_answers_lock:
+            candidates = list(self._similar_answers[(config.model, config.system_prompt)])
+
+        for other_shingles, answer in candidates:
+            # Jaccard similarity cannot reach the threshold when the sizes differ too much
+            smaller, larger = sorted((len(shingles), len(other_shingles)))
+            if smaller < best_similarity * larger:
+                continue
+            intersection = len(shingles & other_shingles)
+            similarity = intersection / (len(shingles) + len(other_shingles) - intersection)
+            if similarity >= best_similarity:
+                best_answer, best_similarity = answer, similarity
+
+        if best_answer is not None:
+            self.logger.info(
+                "Reusing the answer of a near-duplicate prompt (similarity %.3f)", best_similarity
+            )
+        return best_answer
+
+    def _remember_similar_answer(self, message: str, config: ChatConfig, answer: str):
+        """
+        Indexes the answer to a deterministic prompt for near-duplicate lookups.
+
+        Args:
+            message (str): The user message.
+            config (ChatConfig): Configuration for the chat request.
+            answer (str): The answer to the message.
+        """
+        shingles = _shingles(_normalize_prompt(message))
+        with self._similar_answers_lock:
+            self._similar_answers[(config.model, config.system_prompt)].append((shingles, answer))
+
+    def _read_cache(self, key: str) -> Any:
+        """
+        Returns a cached result, checking memory first and then the cache directory.
+
+        Args:
+            key (str): Cache key of the request.
+
+        Returns:
+            Any: The cached result, or None on a cache miss.
+        """
+        if key in self._memory_cache:
+            self._memory_cache.move_to_end(key)
+            return self._memory_cache[key]
+        if self.cache_dir is None:
+            return None
+
+        cache_path = self.cache_dir / f"{key}.json"
+        try:
+            value = orjson.loads(cache_path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except orjson.JSONDecodeError as e:
+            self.logger.warning("Ignoring corrupted cache entry %s: %s", cache_path, e)
+            return None
+
+        self._remember(key, value)
+        return value
+
+    def _write_cache(self, key: str, value: Any):
+        """
+        Stores a result in memory and, if configured, in the cache directory.
+
+        Args:
+            key (str): Cache key of the request.
+            value (Any): The JSON-serializable result to cache.
+        """
+        self._remember(key, value)
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            (self.cache_dir / f"{key}.json").write_bytes(orjson.dumps(value))
+
+    def _remember(self, key: str, value: Any):
+        """
+        Stores a result in memory, evicting the least recently used one when the cache is full.
+
+        Args:
+            key (str): Cache key of the request.
+            value (Any): The result to cache.
+        """
+        self._memory_cache[key] = value
+        self._memory_cache.move_to_end(key)
+        if len(self._memory_cache) > MEMORY_CACHE_SIZE:
+            self._memory_cache.popitem(last=False)
+
+    def _build_messages(self, message: str, config: ChatConfig) -> list[dict]:
+        """
+        Builds the chat messages for a single-turn request.
+
+        Args:
+            message (str): The user message.
+            config (ChatConfig): Configuration providing the system prompt.
+
+        Returns:
+            list[dict]: The system and user messages.
+        """
+        return [system_message(config.system_prompt), {"role": "user", "content": message}]
+
+    def audio_to_text(self, audio_file_path: str, config: AudioConfig | None = None) -> str:
         """
         Transcribes an audio file using the OpenAI API.
 
@@ -74,27 +769,35 @@ class OpenAIClient:
             Exception: If an error occurs during transcription.
         """
         # Use provided config or default
-        if config is None:
-            config = AudioConfig()
+        config = config or DEFAULT_AUDIO_CONFIG
 
         try:
+            cache_key = self._media_cache_key(audio_file_path, "audio", config.model)
+            if (transcription := self._read_cache(cache_key)) is not None:
+                self.logger.info("Using cached transcription of %s", audio_file_path)
+                return transcription
+
+            self._wait_for_capacity(0)
             with open(audio_file_path, "rb") as audio_file:
                 response = self.client.audio.transcriptions.create(
                     file=audio_file, model=config.model
                 )
                 transcription = response.text.strip()
 
-                # Log the transcription result
-                self.logger.info(f"Transcription result: {transcription}")
+            self._write_cache(cache_key, transcription)
 
-                return transcription
+            # Log the transcription result
+            self.logger.info("Transcription result: %s", transcription)
+
+            return transcription
 
         except Exception as e:
             # Log the error and re-raise the exception
             self.logger.error(f"Error during audio transcription: {e}")
             raise
 
-    def generate_image(self, prompt: str, config: ImageConfig = ImageConfig(), n: int = 1) -> str:
+    def generate_image(self, prompt: str, config: ImageConfig | None = None, n: int = 1) -> str:
+        config = config or DEFAULT_IMAGE_CONFIG
         self.logger.info("Sending request to create image...")
         try:
             img_response = self.client.images.generate(
@@ -104,7 +807,7 @@ class OpenAIClient:
 
             if not image_url:
                 raise Exception("No URL found in response.")
-            self.logger.info(f"Image URL received: {image_url}")
+            self.logger.info("Image URL received: %s", image_url)
 
             return image_url
 
@@ -113,7 +816,7 @@ class OpenAIClient:
             self.logger.error(f"Error communicating with OpenAI API: {e}")
             raise
 
-    def image_to_text(self, image_file_path: str, config: ChatConfig = ChatConfig()) -> str:
+    def image_to_text(self, image_file_path: str, config: ChatConfig | None = None) -> str:
         """
         Analyzes an image file using the OpenAI API and returns a description.
 
@@ -127,38 +830,34 @@ class OpenAIClient:
         Raises:
             Exception: If an error occurs during image analysis.
         """
-        self.logger.info(f"Sending request to analyze image: {image_file_path}")
+        config = config or DEFAULT_CHAT_CONFIG
+        self.logger.info("Sending request to analyze image: %s", image_file_path)
         try:
-            # Read and encode the image file
-            with open(image_file_path, "rb") as image_file:
-
-                image_data = base64.b64encode(image_file.read()).decode("utf-8")
-
-            # Determine the image format from file extension
-            file_extension = os.path.splitext(image_file_path)[1].lower()
-            if file_extension in [".jpg", ".jpeg"]:
-                image_format = "jpeg"
-            elif file_extension == ".png":
-                image_format = "png"
-            elif file_extension == ".gif":
-                image_format = "gif"
-            elif file_extension == ".webp":
-                image_format = "webp"
-            else:
-                image_format = "jpeg"  # Default fallback
+            cache_key = self._media_cache_key(
+                image_file_path, "image", config.model, config.temperature, config.system_prompt
+            )
+            if (description := self._read_cache(cache_key)) is not None:
+                self.logger.info("Using cached description of %s", image_file_path)
+                return description
+
+            # Determine the image format from file extension, falling back to jpeg
+            image_format = IMAGE_FORMATS.get(PurePath(image_file_path).suffix.lower(), "jpeg")
 
             # Send the image to the OpenAI API
+            self._wait_for_capacity(
+                estimate_tokens(config.system_prompt) + IMAGE_TOKENS_ESTIMATE + config.max_tokens
+            )
             response = self.client.chat.completions.create(
                 model=config.model,
                 messages=[
-                    {"role": "system", "content": config.system_prompt},
+                    system_message(config.system_prompt),
                     {
                         "role": "user",
                         "content": [
                             {
                                 "type": "image_url",
                                 "image_url": {
-                                    "url": f"data:image/{image_format};base64,{image_data}"
+                                    "url": self._image_data_url(image_file_path, image_format)
                                 },
                             }
                         ],
@@ -167,10 +866,11 @@ class OpenAIClient:
                 temperature=config.temperature,
             )
 
-            description = response.choices[0].message.content.strip()
+            description = self._extract_content(response)
+            self._write_cache(cache_key, description)
 
             # Log the received description
-            self.logger.info(f"Received image transcription: {description}")
+            self.logger.info("Received image transcription: %s", description)
 
             return description
 
@@ -179,6 +879,91 @@ class OpenAIClient:
             self.logger.error(f"Error during image analysis: {e}")
             raise
 
+    def _image_data_url(self, image_file_path: str, image_format: str) -> str:
+        """
+        Builds a base64 data URL for an image file.
+
+        The file is memory-mapped and encoded in chunks straight into a buffer
+        preallocated for the whole URL, so peak memory stays near the size of the
+        encoded output instead of several full copies of the image.
+
+        Args:
+            image_file_path (str): The path to the image file.
+            image_format (str): The image subtype used in the URL, e.g. "png".
+
+        Returns:
+            str: The data URL with the base64-encoded file contents.
+        """
+        import base64
+
+        if (downscaled := self._downscale_image(image_file_path)) is not None:
+            return "data:image/jpeg;base64," + base64.b64encode(downscaled).decode("ascii")
+
+        prefix = f"data:image/{image_format};base64,".encode("ascii")
+
+        with open(image_file_path, "rb") as image_file:
+            size = os.fstat(image_file.fileno()).st_size
+            # mmap cannot map an empty file
+            if size == 0:
+                return prefix.decode("ascii")
+
+            url = bytearray(len(prefix) + 4 * ((size + 2) // 3))
+            url[: len(prefix)] = prefix
+            position = len(prefix)
+
+            with mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for start in range(0, size, BASE64_CHUNK_SIZE):
+                        encoded = base64.b64encode(view[start : start + BASE64_CHUNK_SIZE])
+                        url[position : position + len(encoded)] = encoded
+                        position += len(encoded)
+                finally:
+                    view.release()
+
+        # Base64 output is pure ASCII, which decodes faster than UTF-8
+        return url.decode("ascii")
+
+    def _downscale_image(self, image_file_path: str) -> bytes | None:
+        """
+        Shrinks an image larger than MAX_IMAGE_SIDE and re-encodes it as JPEG.
+
+        Requires Pillow; without it, for images that already fit, or for files Pillow cannot
+        decode, the original file is sent unchanged.
+
+        Args:
+            image_file_path (str): The path to the image file.
+
+        Returns:
+            bytes | None: The downscaled JPEG, or None if the original should be sent.
+        """
+        try:
+            from PIL import Image, UnidentifiedImageError
+        except ImportError:
+            return None
+
+        try:
+            with Image.open(image_file_path) as image:
+                if max(image.size) <= MAX_IMAGE_SIDE:
+                    return None
+
+                original_size = image.size
+                image.thumbnail((MAX_IMAGE_SIDE, MAX_IMAGE_SIDE), Image.LANCZOS)
+                buffer = io.BytesIO()
+                image.convert("RGB").save(
+                    buffer, format="JPEG", quality=DOWNSCALED_JPEG_QUALITY, optimize=True
+                )
+        except (UnidentifiedImageError, OSError) as e:
+            # Let the API decide on files Pillow cannot read, e.g. truncated or unsupported ones
+            self.logger.debug(
+                "Sending %s unchanged, Pillow cannot decode it: %s", image_file_path, e
+            )
+            return None
+
+        self.logger.info(
+            "Downscaled %s from %s to %s for upload", image_file_path, original_size, image.size
+        )
+        return buffer.getvalue()
 
     def create_embedding(self, input_text: str, model: str = "text-embedding-3-small") -> list:
         """
@@ -194,18 +979,79 @@ class OpenAIClient:
         Raises:
             Exception: If an error occurs during embedding creation.
         """
+        cache_key = self._embedding_cache_key(input_text, model)
+        if (embedding := self._read_cache(cache_key)) is not None:
+            self.logger.info("Using cached embedding.")
+            return embedding
+
         try:
             response = self.client.embeddings.create(
                 input=input_text,
                 model=model
             )
             embedding = response.data[0].embedding
+            self._write_cache(cache_key, embedding)
             self.logger.info("Embedding created successfully.")
             return embedding
         except Exception as e:
             self.logger.error(f"Error creating embedding: {e}")
             raise
 
+    def create_embeddings_batch(
+        self, inputs: list[str], model: str = "text-embedding-3-small"
+    ) -> list[list]:
+        """
+        Creates embeddings for several texts, sending them together instead of one request
+        per text. Cached embeddings are reused and only the remaining texts are sent.
+
+        Args:
+            inputs (list[str]): The texts to embed.
+            model (str, optional): The embedding model to use.
+
+        Returns:
+            list[list]: The embedding vectors, in the same order as the inputs.
+
+        Raises:
+            Exception: If an error occurs during embedding creation.
+        """
+        cache_keys = [self._embedding_cache_key(input_text, model) for input_text in inputs]
+        embeddings = [self._read_cache(cache_key) for cache_key in cache_keys]
+        missing = [index for index, embedding in enumerate(embeddings) if embedding is None]
+        self.logger.info(
+            "Creating %d embeddings, %d cached", len(missing), len(inputs) - len(missing)
+        )
+
+        try:
+            for start in range(0, len(missing), EMBEDDING_BATCH_SIZE):
+                batch = missing[start : start + EMBEDDING_BATCH_SIZE]
+                response = self.client.embeddings.create(
+                    input=[inputs[index] for index in batch], model=model
+                )
+                # Each result carries the position of its input in the request
+                for data in response.data:
+                    index = batch[data.index]
+                    embeddings[index] = data.embedding
+                    self._write_cache(cache_keys[index], data.embedding)
+        except Exception as e:
+            self.logger.error(f"Error creating embeddings: {e}")
+            raise
+
+        return embeddings
+
+    @staticmethod
+    def _embedding_cache_key(input_text: str, model: str) -> str:
+        """
+        Builds the cache key of an embedding request.
+
+        Args:
+            input_text (str): The text to embed.
+            model (str): The embedding model.
+
+        Returns:
+            str: Hex digest identifying the request.
+        """
+        return hashlib.sha256(f"embedding|{model}|{input_text}".encode("utf-8")).hexdigest()
+
     def _get_api_key(self) -> str:
         """
         Retrieves the OpenAI API key from the environment variables.
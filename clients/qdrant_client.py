@@ -1,33 +1,157 @@
+import heapq
+import itertools
 import logging
-from typing import Any, Optional
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
 from qdrant_client import QdrantClient as QdrantSDK
 from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
     Distance,
+    QuantizationConfig,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
     VectorParams,
     PointStruct,
     Filter,
     FieldCondition,
     MatchValue,
     PointIdsList,
+    SearchRequest,
 )
 
+# Points sent per upsert request by add_points_batched() and add_points_batch()
+UPSERT_BATCH_SIZE = 64
+
+# Upsert requests in flight at once in add_points_batched() and add_points_batch()
+UPSERT_PARALLEL = 2
+
+# Queries sent per request by search_batch()
+SEARCH_BATCH_SIZE = 16
+
+# Points fetched per scroll request by iter_points()
+SCROLL_BATCH_SIZE = 256
+
+
+@dataclass(frozen=True, slots=True)
+class SearchResult:
+    """A single search hit."""
+
+    id: str | int
+    score: float
+    payload: dict
+
+    def as_dict(self) -> dict:
+        """
+        Convert the result to a dictionary.
+
+        Returns:
+            Dictionary with id, score, and payload
+        """
+        return {"id": self.id, "score": self.score, "payload": self.payload}
+
+
+@dataclass(frozen=True, slots=True)
+class SearchBatch:
+    """
+    Search results stored column-wise: one list of ids, one double array of scores, one
+    list of payloads, all aligned by position.
+    """
+
+    ids: list[str | int] = field(default_factory=list)
+    scores: array = field(default_factory=lambda: array("d"))
+    payloads: list[dict] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def above(self, threshold: float) -> "SearchBatch":
+        """
+        Keep only the results scoring above a threshold.
+
+        Args:
+            threshold: Minimum score, exclusive
+
+        Returns:
+            A new SearchBatch with the matching results
+        """
+        keep = [i for i, score in enumerate(self.scores) if score > threshold]
+        return SearchBatch(
+            ids=[self.ids[i] for i in keep],
+            scores=array("d", (self.scores[i] for i in keep)),
+            payloads=[self.payloads[i] for i in keep],
+        )
+
+    def to_results(self) -> list[SearchResult]:
+        """
+        Convert the results to the row-wise format returned by QdrantClient.search.
+
+        Returns:
+            List of SearchResult objects
+        """
+        return [
+            SearchResult(id=point_id, score=score, payload=payload)
+            for point_id, score, payload in zip(self.ids, self.scores, self.payloads)
+        ]
+
+    def to_dicts(self) -> list[dict]:
+        """
+        Convert the results to dictionaries.
+
+        Returns:
+            List of search results with id, score, and payload
+        """
+        return [
+            {"id": point_id, "score": score, "payload": payload}
+            for point_id, score, payload in zip(self.ids, self.scores, self.payloads)
+        ]
+
 
 class QdrantClient:
     """Universal Qdrant vector database client for managing collections and vectors."""
 
-    def __init__(self, host: str = "localhost", port: int = 6333):
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6333,
+        grpc_port: int = 6334,
+        prefer_grpc: bool = True,
+        hosts: Optional[list[str]] = None,
+    ):
         """
         Initialize Qdrant client.
 
         Args:
             host: Qdrant server host
-            port: Qdrant server port
+            port: Qdrant server REST port
+            grpc_port: Qdrant server gRPC port
+            prefer_grpc: Whether to talk to the server over gRPC, which has less per-request
+                overhead for bulk upserts and searches than REST
+            hosts: Optional hosts of several Qdrant servers that each hold part of the data,
+                searched together by search_sharded(). Defaults to just host
         """
-        self.client = QdrantSDK(host=host, port=port)
-        logging.info(f"Initialized Qdrant client connecting to {host}:{port}")
+        self.client = QdrantSDK(host=host, port=port, grpc_port=grpc_port, prefer_grpc=prefer_grpc)
+        self.shard_clients = [
+            QdrantSDK(host=shard_host, port=port, grpc_port=grpc_port, prefer_grpc=prefer_grpc)
+            for shard_host in hosts or []
+            if shard_host != host
+        ]
+        self.shard_clients.insert(0, self.client)
+        transport = f"gRPC on port {grpc_port}" if prefer_grpc else f"REST on port {port}"
+        logging.info(
+            f"Initialized Qdrant client connecting to {len(self.shard_clients)} host(s) "
+            f"starting with {host} over {transport}"
+        )
 
     def create_collection(
-        self, collection_name: str, vector_size: int, distance: Distance = Distance.COSINE
+        self,
+        collection_name: str,
+        vector_size: int,
+        distance: Distance = Distance.COSINE,
+        quantization: Optional[str] = None,
     ) -> bool:
         """
         Create a new collection in Qdrant.
@@ -36,14 +160,24 @@ class QdrantClient:
             collection_name: Name of the collection to create
             vector_size: Dimension of vectors to store
             distance: Distance metric to use (COSINE, DOT, EUCLID)
+            quantization: How vectors are compressed for search: "scalar" (int8, a quarter
+                of the memory), "binary" (one bit per dimension), or None (the default) to
+                search the full float32 vectors in RAM. Quantization trades some recall for
+                memory, and keeps the quantized vectors in RAM and the originals on disk
 
         Returns:
             True if collection was created successfully
         """
         try:
+            quantization_config = self._quantization_config(quantization)
             self.client.create_collection(
                 collection_name=collection_name,
-                vectors_config=VectorParams(size=vector_size, distance=distance),
+                vectors_config=VectorParams(
+                    size=vector_size,
+                    distance=distance,
+                    on_disk=quantization_config is not None,
+                ),
+                quantization_config=quantization_config,
             )
             logging.info(f"Created collection '{collection_name}' with vector size {vector_size}")
             return True
@@ -51,6 +185,27 @@ class QdrantClient:
             logging.error(f"Failed to create collection '{collection_name}': {e}")
             return False
 
+    @staticmethod
+    def _quantization_config(quantization: Optional[str]) -> Optional[QuantizationConfig]:
+        """
+        Build the quantization config of a collection.
+
+        Args:
+            quantization: "scalar", "binary", or None
+
+        Returns:
+            Quantization config for create_collection, or None for no quantization
+        """
+        if quantization is None:
+            return None
+        if quantization == "scalar":
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(type=ScalarType.INT8, always_ram=True)
+            )
+        if quantization == "binary":
+            return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+        raise ValueError(f"Unknown quantization '{quantization}'")
+
     def collection_exists(self, collection_name: str) -> bool:
         """
         Check if a collection exists.
@@ -106,6 +261,92 @@ class QdrantClient:
             logging.error(f"Failed to add points to collection '{collection_name}': {e}")
             return False
 
+    def add_points_batched(
+        self,
+        collection_name: str,
+        points: list[PointStruct],
+        batch_size: int = UPSERT_BATCH_SIZE,
+        parallel: int = UPSERT_PARALLEL,
+        wait: bool = True,
+    ) -> bool:
+        """
+        Add many points to a collection in fixed-size batches, upserted concurrently.
+
+        Args:
+            collection_name: Name of the collection
+            points: List of PointStruct objects to add
+            batch_size: Number of points per upsert request
+            parallel: Maximum number of upsert requests in flight at once
+            wait: Whether each upsert waits for the points to be applied. With False the
+                server only acknowledges receipt, which is faster for bulk loads
+
+        Returns:
+            True if all batches were added successfully
+        """
+        batches = [points[i:i + batch_size] for i in range(0, len(points), batch_size)]
+
+        def upsert(batch: list[PointStruct]):
+            self.client.upsert(collection_name=collection_name, points=batch, wait=wait)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, parallel)) as executor:
+                # Consume the iterator so the first failed batch raises here
+                list(executor.map(upsert, batches))
+            logging.info(
+                f"Added {len(points)} points in {len(batches)} batches "
+                f"to collection '{collection_name}'"
+            )
+            return True
+        except Exception as e:
+            logging.error(f"Failed to add points to collection '{collection_name}': {e}")
+            return False
+
+    def add_points_batch(
+        self,
+        collection_name: str,
+        ids: list[str | int],
+        vectors: list[list[float]],
+        payloads: Optional[list[dict[str, Any]]] = None,
+        batch_size: int = UPSERT_BATCH_SIZE,
+        parallel: int = UPSERT_PARALLEL,
+        wait: bool = True,
+    ) -> bool:
+        """
+        Add many points to a collection with the SDK's upload_collection.
+
+        The points are sent column-wise, so no PointStruct is built per point, and the
+        batches are uploaded by several worker processes at once.
+
+        Args:
+            collection_name: Name of the collection
+            ids: Unique identifiers of the points
+            vectors: Vector embeddings, in the same order as ids
+            payloads: Optional metadata dictionaries, in the same order as ids
+            batch_size: Number of points per upload request
+            parallel: Number of worker processes uploading batches at once. Each process
+                opens its own client, so values above 1 only pay off for large uploads
+            wait: Whether each upload waits for the points to be applied. With False the
+                server only acknowledges receipt, so searches right after may miss points
+
+        Returns:
+            True if the points were added successfully
+        """
+        try:
+            self.client.upload_collection(
+                collection_name=collection_name,
+                vectors=vectors,
+                payload=payloads,
+                ids=ids,
+                batch_size=batch_size,
+                parallel=max(1, parallel),
+                wait=wait,
+            )
+            logging.info(f"Added {len(ids)} points to collection '{collection_name}'")
+            return True
+        except Exception as e:
+            logging.error(f"Failed to add points to collection '{collection_name}': {e}")
+            return False
+
     def add_point(
         self,
         collection_name: str,
@@ -139,7 +380,7 @@ class QdrantClient:
         limit: int = 10,
         filter_conditions: Optional[Filter] = None,
         score_threshold: Optional[float] = None,
-    ) -> list[dict]:
+    ) -> list[SearchResult]:
         """
         Search for similar vectors in a collection.
 
@@ -151,7 +392,32 @@ class QdrantClient:
             score_threshold: Optional minimum score threshold
 
         Returns:
-            List of search results with id, score, and payload
+            List of SearchResult objects, best first
+        """
+        return self.search_columns(
+            collection_name, query_vector, limit, filter_conditions, score_threshold
+        ).to_results()
+
+    def search_columns(
+        self,
+        collection_name: str,
+        query_vector: list[float],
+        limit: int = 10,
+        filter_conditions: Optional[Filter] = None,
+        score_threshold: Optional[float] = None,
+    ) -> SearchBatch:
+        """
+        Search for similar vectors in a collection, returning the results column-wise.
+
+        Args:
+            collection_name: Name of the collection to search
+            query_vector: Query vector as list of floats
+            limit: Maximum number of results to return
+            filter_conditions: Optional filter conditions
+            score_threshold: Optional minimum score threshold
+
+        Returns:
+            SearchBatch with the ids, scores, and payloads of the results
         """
         try:
             results = self.client.search(
@@ -162,19 +428,129 @@ class QdrantClient:
                 score_threshold=score_threshold,
             )
 
-            search_results = []
-            for result in results:
-                search_results.append(
-                    {"id": result.id, "score": result.score, "payload": result.payload}
-                )
+            search_results = SearchBatch(
+                ids=[result.id for result in results],
+                scores=array("d", (result.score for result in results)),
+                payloads=[result.payload for result in results],
+            )
 
             logging.info(f"Found {len(search_results)} results in collection '{collection_name}'")
             return search_results
 
         except Exception as e:
             logging.error(f"Failed to search collection '{collection_name}': {e}")
+            return SearchBatch()
+
+    def search_sharded(
+        self,
+        collection_name: str,
+        query_vector: list[float],
+        limit: int = 10,
+        filter_conditions: Optional[Filter] = None,
+        score_threshold: Optional[float] = None,
+    ) -> list[SearchResult]:
+        """
+        Search every host given at construction in parallel and merge the best results.
+
+        Each server searches only its own part of the data, so the overall top results
+        are the top results of all servers combined. Scores are merged highest first, as
+        for the COSINE and DOT distances.
+
+        Args:
+            collection_name: Name of the collection to search on every host
+            query_vector: Query vector as list of floats
+            limit: Maximum number of results to return
+            filter_conditions: Optional filter conditions
+            score_threshold: Optional minimum score threshold
+
+        Returns:
+            List of SearchResult objects, best first
+        """
+
+        def search_shard(client: QdrantSDK) -> list:
+            return client.search(
+                collection_name=collection_name,
+                query_vector=query_vector,
+                query_filter=filter_conditions,
+                limit=limit,
+                score_threshold=score_threshold,
+            )
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(self.shard_clients)) as executor:
+                shard_results = list(executor.map(search_shard, self.shard_clients))
+
+            # Every shard returns its results best first, so a k-way merge finds the overall best
+            merged = heapq.merge(*shard_results, key=lambda result: result.score, reverse=True)
+            search_results = [
+                SearchResult(id=result.id, score=result.score, payload=result.payload)
+                for result in itertools.islice(merged, limit)
+            ]
+
+            logging.info(
+                f"Found {len(search_results)} results across {len(self.shard_clients)} "
+                f"hosts in collection '{collection_name}'"
+            )
+            return search_results
+
+        except Exception as e:
+            logging.error(f"Failed to search collection '{collection_name}' across hosts: {e}")
             return []
 
+    def search_batch(
+        self,
+        collection_name: str,
+        query_vectors: list[list[float]],
+        limit: int = 10,
+        filter_conditions: Optional[Filter] = None,
+        score_threshold: Optional[float] = None,
+        batch_size: int = SEARCH_BATCH_SIZE,
+    ) -> list[list[SearchResult]]:
+        """
+        Search for vectors similar to each of many query vectors, several queries per request.
+
+        Args:
+            collection_name: Name of the collection to search
+            query_vectors: Query vectors as lists of floats
+            limit: Maximum number of results to return per query
+            filter_conditions: Optional filter conditions applied to every query
+            score_threshold: Optional minimum score threshold
+            batch_size: Number of queries sent in one request
+
+        Returns:
+            One list of SearchResult objects per query vector, in the order of the query vectors
+        """
+        try:
+            search_results = []
+            for i in range(0, len(query_vectors), batch_size):
+                requests = [
+                    SearchRequest(
+                        vector=query_vector,
+                        filter=filter_conditions,
+                        limit=limit,
+                        score_threshold=score_threshold,
+                        with_payload=True,
+                    )
+                    for query_vector in query_vectors[i:i + batch_size]
+                ]
+                batch_results = self.client.search_batch(
+                    collection_name=collection_name, requests=requests
+                )
+                for results in batch_results:
+                    search_results.append(
+                        [
+                            SearchResult(id=result.id, score=result.score, payload=result.payload)
+                            for result in results
+                        ]
+                    )
+
+            logging.info(f"Ran {len(query_vectors)} searches in collection '{collection_name}'")
+            return search_results
+
+        except Exception as e:
+            logging.error(f"Failed to search collection '{collection_name}': {e}")
+            return [[] for _ in query_vectors]
+
     def get_point(self, collection_name: str, point_id: str | int) -> Optional[dict]:
         """
         Retrieve a specific point by ID.
@@ -207,6 +583,43 @@ class QdrantClient:
             )
             return None
 
+    def iter_points(
+        self,
+        collection_name: str,
+        batch_size: int = SCROLL_BATCH_SIZE,
+        filter_conditions: Optional[Filter] = None,
+        with_vectors: bool = True,
+    ) -> Iterator[dict]:
+        """
+        Iterate over the points of a collection, fetching them page by page.
+
+        Only one page is held in memory at a time, so whole collections can be scanned
+        without loading every point at once.
+
+        Args:
+            collection_name: Name of the collection
+            batch_size: Number of points fetched per request
+            filter_conditions: Optional filter conditions
+            with_vectors: Whether to fetch the vectors along with the payloads
+
+        Yields:
+            Dictionaries with point data
+        """
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=collection_name,
+                scroll_filter=filter_conditions,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=with_vectors,
+            )
+            for point in points:
+                yield {"id": point.id, "vector": point.vector, "payload": point.payload}
+            if offset is None:
+                return
+
     def delete_points(self, collection_name: str, point_ids: list[str | int]) -> bool:
         """
         Delete multiple points from a collection.
@@ -268,13 +681,21 @@ class QdrantClient:
             logging.error(f"Failed to get info for collection '{collection_name}': {e}")
             return None
 
-    def count_points(self, collection_name: str, filter_conditions: Optional[Filter] = None) -> int:
+    def count_points(
+        self,
+        collection_name: str,
+        filter_conditions: Optional[Filter] = None,
+        exact: bool = False,
+    ) -> int:
         """
         Count points in a collection with optional filtering.
 
         Args:
             collection_name: Name of the collection
             filter_conditions: Optional filter conditions
+            exact: Whether to scan the matching points for an exact count. The default
+                approximate count is estimated from segment metadata, which is much faster
+                on large collections but may be off, especially with filters
 
         Returns:
             Number of points matching the criteria
@@ -283,7 +704,7 @@ class QdrantClient:
             result = self.client.count(
                 collection_name=collection_name,
                 count_filter=filter_conditions,
-                exact=True,  # Use exact counting for accuracy
+                exact=exact,
             )
             count = result.count
             logging.info(f"Collection '{collection_name}' contains {count} points")
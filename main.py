@@ -1,33 +1,92 @@
 import argparse
+import asyncio
+import atexit
 import importlib
 import logging
+import os
+import queue
 import sys
-
-from dotenv import load_dotenv
+from logging.handlers import QueueHandler, QueueListener
+from types import ModuleType
 
 # List of tasks that are excluded from being run as scripts
 EXCLUDED_TASKS = ["s01e04"]
 
+# Task modules already resolved by load_task_module(), by task id
+_TASK_CACHE: dict[str, ModuleType] = {}
+
 def setup_logging():
-    """Set up logging configuration for the application."""
-    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    """
+    Set up logging configuration for the application.
 
-def main():
-    """Main function to parse arguments, validate tasks, and execute the specified task."""
-    # Load environment variables from .env file
-    load_dotenv()
+    Task code only enqueues log records; a background listener thread formats them and
+    writes them to the real handlers, so a slow sink never blocks the request path.
+    Set LOG_FILE to additionally write logs to a file.
+    """
+    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+    handlers = [logging.StreamHandler()]
+    if log_file := os.environ.get("LOG_FILE"):
+        handlers.append(logging.FileHandler(log_file, encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
 
-    # Configure logging
-    setup_logging()
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    # Flush the remaining records on interpreter exit
+    atexit.register(listener.stop)
+
+    logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(log_queue)])
+
+def setup_event_loop():
+    """
+    Use uvloop for the event loops that tasks start with asyncio.run, if it is installed.
+
+    Its libuv-based loop has less per-request overhead than the default selector loop when
+    many concurrent requests are in flight. Without uvloop the default loop is kept.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logging.info("Using uvloop event loop")
 
+def load_task_module(task_id: str) -> ModuleType:
+    """
+    Import the module of a task, reusing it if it was already resolved.
+
+    Args:
+        task_id: The task id, e.g. 's01e03'
+
+    Returns:
+        The task module
+    """
+    if (task_module := _TASK_CACHE.get(task_id)) is None:
+        task_module = _TASK_CACHE[task_id] = importlib.import_module(f"{task_id}.{task_id}")
+    return task_module
+
+def main():
+    """Main function to parse arguments, validate tasks, and execute the specified task."""
     # Set up argument parser
     parser = argparse.ArgumentParser(description="Run a specific task by specifying its name.")
     parser.add_argument("--task", required=True, help="The task id to run (e.g., 's01e03').")
 
-    # Parse arguments
+    # Parse arguments first, so --help and usage errors exit before anything else is loaded
     args = parser.parse_args()
     task_id = args.task
 
+    # Load environment variables from .env file
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    # Configure logging
+    setup_logging()
+
+    # Pick the fastest available event loop for asynchronous tasks
+    setup_event_loop()
+
     # Check if the task is in the excluded list
     if task_id in EXCLUDED_TASKS:
         logging.info(f"Task '{task_id}' is not intended to run as a script. Visit the task directory and solve manually.")
@@ -35,7 +94,7 @@ def main():
 
     try:
         # Dynamically import the task module
-        task_module = importlib.import_module(f"{task_id}.{task_id}")
+        task_module = load_task_module(task_id)
 
         # Check if the module has a main() function
         if not hasattr(task_module, "main"):
@@ -2,8 +2,9 @@ import re
 import requests
 import logging
 import os
-from openai import OpenAI
 from bs4 import BeautifulSoup
+from clients.openai_client import OpenAIClient
+from clients.llm_configs import ChatConfig
 
 # Konfiguracja loggera
 logging.basicConfig(
@@ -57,17 +58,17 @@ class WebClient:
         return response
 
 
-class OpenAIClient:
-    """Klasa obsługująca komunikację z API OpenAI wykorzystująca oficjalną bibliotekę."""
+class YearAnswerer:
+    """Klasa odpowiadająca na pytania o rok z użyciem współdzielonego klienta OpenAI."""
 
-    def __init__(self, api_key: str, model: str = "gpt-4.1-nano"):
+    def __init__(self, openai_client: OpenAIClient, model: str = "gpt-4.1-nano"):
+        self.openai_client = openai_client
         self.model = model
-        self.client = OpenAI(api_key=api_key)
-        self.logger = logging.getLogger("robot_login.OpenAIClient")
+        self.logger = logging.getLogger("robot_login.YearAnswerer")
 
     def get_year_answer(self, question: str) -> str:
         """
-        Pobiera odpowiedź na pytanie z modelu LLM korzystając z oficjalnej biblioteki OpenAI.
+        Pobiera odpowiedź na pytanie z modelu LLM korzystając ze współdzielonego klienta OpenAI.
         Prompt skonstruowany jest tak, aby odpowiedź zawierała tylko rok.
         """
         self.logger.info(f"Wysyłanie pytania do modelu {self.model}")
@@ -87,18 +88,11 @@ class OpenAIClient:
         """
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": prompt},
-                    {"role": "user", "content": question},
-                ],
-                temperature=0.1,
+            answer = self.openai_client.send_message(
+                question,
+                ChatConfig(model=self.model, temperature=0.1, system_prompt=prompt),
             )
 
-            # Wyciąganie odpowiedzi
-            answer = response.choices[0].message.content.strip()
-
             # Upewniamy się, że odpowiedź to sam rok (4 cyfry)
             if not answer.isdigit():
                 self.logger.warning(f"Otrzymana odpowiedź nie jest liczbą: {answer}")
@@ -134,7 +128,7 @@ def main():
     try:
         # Inicjalizacja klientów
         web_client = WebClient(url)
-        openai_client = OpenAIClient(api_key)
+        year_answerer = YearAnswerer(OpenAIClient(api_key))
 
         # Krok 1: Pobierz stronę logowania
         html_content = web_client.fetch_login_page()
@@ -143,7 +137,7 @@ def main():
         question = web_client.extract_question(html_content)
 
         # Krok 3: Uzyskaj odpowiedź od modelu LLM
-        answer = openai_client.get_year_answer(question)
+        answer = year_answerer.get_year_answer(question)
 
         # Krok 4: Wykonaj logowanie
         response = web_client.login(username, password, answer)
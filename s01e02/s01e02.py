@@ -1,5 +1,4 @@
 import json
-from openai import chat
 import requests
 import logging
 
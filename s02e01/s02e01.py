@@ -1,6 +1,10 @@
-import json
+import io
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import orjson
 
 from clients.centrala_client import CentralaClient
 from clients.local_llm_client import LocalLLMClient
@@ -8,69 +12,99 @@ from clients.openai_client import ChatConfig, OpenAIClient
 
 from s02e01.prompt import SYSTEM_PROMPT
 
+# Number of audio files transcribed at once
+MAX_WORKERS = 8
+
 
 class TaskSolver:
     def __init__(
         self,
         audio_files_path: str = "task06/audio_files",
         transcriptions_files_path: str = "task06/transcriptions",
+        openai_client: OpenAIClient | None = None,
     ) -> None:
         self.audio_files_path = audio_files_path
         self.transcriptions_files_path = transcriptions_files_path
-        self.openai_client = OpenAIClient()
+        self.openai_client = openai_client or OpenAIClient()
 
     def transcribe_audio_files(self):
         """
         Transcribes audio files using the OpenAI API and saves the transcriptions to files.
         """
         # Get the list of audio files
-        audio_files = os.listdir(self.audio_files_path)
+        with os.scandir(self.audio_files_path) as entries:
+            audio_files = [entry.name for entry in entries if entry.is_file()]
         logging.info(f"Found {len(audio_files)} audio files to transcribe.")
 
-        for audio_file in audio_files:
-            logging.info(f"Transcribing {audio_file}...")
+        # List the existing transcriptions once instead of once per audio file
+        existing = set(os.listdir(self.transcriptions_files_path))
 
-            transcription_filename = f"{audio_file}.txt"
+        # Transcriptions wait on the network, so run several of them at once
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(self._transcribe_one, audio_file, existing): audio_file
+                for audio_file in audio_files
+            }
+            for future in as_completed(futures):
+                # Re-raise any error from the transcription
+                future.result()
+                logging.info(f"Finished {futures[future]}")
 
-            if transcription_filename in os.listdir(self.transcriptions_files_path):
-                logging.info(f"Transcription for {audio_file} already exists. Skipping...")
-                continue
+        logging.info("All files have been transcribed.")
 
-            audio_file_path = os.path.join(self.audio_files_path, audio_file)
-            transcription = self.openai_client.audio_to_text(audio_file_path)
+    def _transcribe_one(self, audio_file: str, existing: set[str]):
+        """
+        Transcribes a single audio file and saves the transcription, unless it already exists.
+        """
+        transcription_filename = f"{audio_file}.txt"
 
-            logging.info(f"Transcription for {audio_file}: \n{transcription}")
-            logging.info(f"Saving transcription to {transcription_filename}...")
-            # Save the transcription to a file
-            transcription_file_path = os.path.join(
-                self.transcriptions_files_path, transcription_filename
-            )
-            with open(transcription_file_path, "w") as f:
-                f.write(transcription)
+        if transcription_filename in existing:
+            logging.info(f"Transcription for {audio_file} already exists. Skipping...")
+            return
 
-        logging.info("All files have been transcribed.")
+        logging.info(f"Transcribing {audio_file}...")
+        audio_file_path = os.path.join(self.audio_files_path, audio_file)
+        transcription = self.openai_client.audio_to_text(audio_file_path)
+
+        logging.info(f"Transcription for {audio_file}: \n{transcription}")
+        logging.info(f"Saving transcription to {transcription_filename}...")
+        # Save the transcription to a file
+        transcription_file_path = os.path.join(
+            self.transcriptions_files_path, transcription_filename
+        )
+        with open(transcription_file_path, "w") as f:
+            f.write(transcription)
 
     def read_transcriptions_content(self) -> str:
         """
-        Reads the content of all transcription files and returns them as a list of strings.
+        Reads the content of all transcription files and returns them as a single string.
+
+        Files are read in name order, so the same transcriptions always produce the same
+        prompt, and repeat runs can be answered from the OpenAI client's cache.
         """
         logging.info("Reading transcriptions...")
-        transcriptions = []
-        for filename in os.listdir(self.transcriptions_files_path):
-            logging.info(f"Reading {filename}...")
-            with open(os.path.join(self.transcriptions_files_path, filename), "r") as f:
-                transcriptions.append(f.read())
-
-        transcriptions_content = "\n\n".join(transcriptions)
+        with os.scandir(self.transcriptions_files_path) as entries:
+            paths = sorted(entry.path for entry in entries if entry.is_file())
+
+        # Write each file straight into one buffer instead of keeping a list of all of them
+        buffer = io.StringIO()
+        for index, path in enumerate(paths):
+            logging.info(f"Reading {os.path.basename(path)}...")
+            if index:
+                buffer.write("\n\n")
+            buffer.write(Path(path).read_bytes().decode())
+
+        transcriptions_content = buffer.getvalue()
         logging.info("All transcriptions have been read.")
-        logging.info(f"Transcriptions content: \n{transcriptions_content}")
+        # The full content is only formatted when debug logging is enabled
+        logging.debug("Transcriptions content: \n%s", transcriptions_content)
         return transcriptions_content
 
 
 def main():
     open_ai_client = OpenAIClient()
     centrala_client = CentralaClient(task_identifier="mp3")
-    task_solver = TaskSolver()
+    task_solver = TaskSolver(openai_client=open_ai_client)
 
     task_solver.transcribe_audio_files()
     llm_response = open_ai_client.send_message(
@@ -79,7 +113,7 @@ def main():
     )
 
     # The LLM response should be a JSON string, let's parse it to dict
-    response_dict = json.loads(llm_response)
+    response_dict = orjson.loads(llm_response)
     ulica = response_dict.get("ulica")
 
     # Send the response back to Centrala
@@ -1,5 +1,7 @@
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from clients.centrala_client import CentralaClient
 from clients.openai_client import OpenAIClient
@@ -8,11 +10,32 @@ from clients.openai_client import OpenAIClient
 TASK_NAME = "robotid"
 TASK_URL_BASE = "https://c3ntrala.ag3nts.org/data/KLUCZ-API/robotid.json"
 
+# Connect and read timeouts in seconds
+REQUEST_TIMEOUT = (3.05, 30)
+
+
+def _create_session() -> requests.Session:
+    """
+    Creates a session that keeps connections alive and retries transient server errors.
+
+    Returns:
+        requests.Session: Session shared by all requests of this module.
+    """
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    session.mount(
+        "https://", HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retries)
+    )
+    return session
+
+
+_SESSION = _create_session()
+
 
 class TaskSolver:
     def get_task(self, task_url: str):
         logging.info("Getting task...")
-        task = requests.get(task_url)
+        task = _SESSION.get(task_url, timeout=REQUEST_TIMEOUT)
         task.raise_for_status()
 
         return task.json()
@@ -1,17 +1,68 @@
-import json
+import asyncio
+import hashlib
 import logging
 import os
+import threading
+from collections import defaultdict
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
 from typing import Callable
 
+import orjson
+
 from clients.centrala_client import CentralaClient
 from clients.openai_client import AudioConfig, ChatConfig, OpenAIClient
 
-from s02e04.prompts import CATEGORIZE_PROMPT, IMAGE_PROMPT
+from s02e04.prompts import CATEGORIZE_GROUP_PROMPT, CATEGORIZE_PROMPT, IMAGE_PROMPT
+from utils.rate_limiter import RateLimiter
 
 
 FILES_DIR_PATH = "/Users/mcbartop/Code/ai_devs_3/downloaded_data/pliki_z_fabryki"
 EXCLUDED = ["2024-11-12_report-99.png", "facts", "extractions", "flag.png", "weapons_tests.zip"]
 
+# Number of files transcribed and categorized at once
+MAX_WORKERS = 8
+
+# Whisper transcriptions in flight at once, as its rate limits are tighter than chat's
+MAX_TRANSCRIPTIONS = 3
+
+# Account limits that all OpenAI requests of this task are throttled to
+OPENAI_MAX_REQUESTS_PER_MINUTE = 500
+OPENAI_MAX_TOKENS_PER_MINUTE = 200_000
+
+AUDIO_CONFIG = AudioConfig(model="whisper-1")
+IMAGE_CONFIG = ChatConfig(model="gpt-4.1-mini", system_prompt=IMAGE_PROMPT)
+CATEGORIZE_CONFIG = ChatConfig(model="gpt-4o-mini", system_prompt=CATEGORIZE_PROMPT)
+CATEGORIZE_GROUP_CONFIG = ChatConfig(model="gpt-4o-mini", system_prompt=CATEGORIZE_GROUP_PROMPT)
+
+# Characters of content categorized in one request (about 10k tokens). Well within the
+# context window, and enough for all of the task's reports to go in a single request
+CATEGORIZE_GROUP_MAX_CHARS = 40_000
+
+# Categorize with one Batch API job, at half the price, instead of a request per file.
+# Batch jobs can take up to 24 hours to complete
+USE_BATCH_API = False
+
+# Bump to drop all cached categories, e.g. after changing how categories are assigned
+CATEGORIZE_CACHE_VERSION = 1
+
+# Part of every categorization cache key, so a change to either categorization prompt or
+# model invalidates old entries
+CATEGORIZE_CACHE_PREFIX = hashlib.sha256(
+    "|".join(
+        [
+            str(CATEGORIZE_CACHE_VERSION),
+            CATEGORIZE_CONFIG.model,
+            CATEGORIZE_PROMPT,
+            CATEGORIZE_GROUP_CONFIG.model,
+            CATEGORIZE_GROUP_PROMPT,
+            "",
+        ]
+    ).encode("utf-8")
+).hexdigest()
+
 
 class TaskSolver:
     def __init__(
@@ -21,11 +72,20 @@ class TaskSolver:
         excluded_files: list = EXCLUDED,
     ) -> None:
         self.files_dir_path = files_dir_path
-        self.excluded_files = excluded_files
+        self.excluded_files = frozenset(excluded_files)
         self.transcriptions_path = os.path.join(self.files_dir_path, "transcriptions")
-        self.files = {}
+        # Names of the saved transcription files, listed once by check_if_transcription_exists
+        self._transcription_set: set[str] | None = None
+        self.files: defaultdict[str, list[str]] = defaultdict(list)
         self.results = {"people": [], "hardware": []}
         self.openai_client = openai_client
+        # Thread pool shared by the text, audio and image phases
+        self.executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+
+        # Categories of previously seen contents, kept between runs
+        self.category_cache_path = os.path.join(self.files_dir_path, ".cache", "categorize.json")
+        self._category_cache = self._load_category_cache()
+        self._category_cache_lock = threading.Lock()
 
     def read_files(self):
         logging.info("Reading files from directory...")
@@ -34,119 +94,253 @@ class TaskSolver:
         if not os.path.isdir(self.files_dir_path):
             raise ValueError(f"Directory {self.files_dir_path} does not exist.")
 
-        # Add count logging:
-        total_files = len(os.listdir(self.files_dir_path))
-        logging.info(f"Found {total_files} total files in directory")
-
         self.files.clear()
 
+        # One pass over the directory; DirEntry caches the file type, so directories such
+        # as the transcriptions folder are skipped without an extra stat
+        total_files = 0
         excluded_count = 0
-        for filename in os.listdir(self.files_dir_path):
-            if filename in self.excluded_files:
-                excluded_count += 1
-                logging.debug(f"Excluding file: {filename}") 
-                continue
-
-            file_ext = os.path.splitext(filename)[1].lower().lstrip(".")
-            self.files.setdefault(file_ext, []).append(filename)
+        with os.scandir(self.files_dir_path) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                total_files += 1
+
+                filename = entry.name
+                if filename in self.excluded_files:
+                    excluded_count += 1
+                    logging.debug("Excluding file: %s", filename)
+                    continue
+
+                # Same result as os.path.splitext, including "" for names like ".hidden"
+                stem, dot, file_ext = filename.rpartition(".")
+                file_ext = file_ext.lower() if dot and stem.strip(".") else ""
+                self.files[file_ext].append(filename)
 
         # Add summary logging:
+        logging.info(f"Found {total_files} total files in directory")
         logging.info(f"Excluded {excluded_count} files")
-        logging.info(f"Files by extension: {dict((k, len(v)) for k, v in self.files.items())}")
-
-    def process_text_files(self):
+        logging.info(f"Files by extension: { {k: len(v) for k, v in self.files.items()} }")
+
+    def process_all_files(self):
+        """
+        Categorizes the text, audio and image files in one concurrent pass.
+
+        Slow Whisper transcriptions overlap with the chat requests for the other files
+        instead of holding up a phase of their own. Results are recorded in the same order
+        as running the text, audio and image phases one after another.
+        """
+        self._prepare_transcriptions()
+
+        filenames = self._ordered_filenames()
+        logging.info(f"Processing {len(filenames)} files")
+
+        self._record_categories(filenames, asyncio.run(self._process_all_files_async()))
+        self.save_category_cache()
+
+    def _ordered_filenames(self) -> list[str]:
+        """
+        Returns the files to process in text, audio, image order, the order of the results
+        of _process_all_files_async.
+        """
+        return [filename for ext in ("txt", "mp3", "png") for filename in self.files.get(ext, [])]
+
+    async def _process_all_files_async(self, categorize: bool = True) -> list[str | None]:
+        """
+        Processes every file as a coroutine, running its blocking API calls on the shared
+        thread pool.
+
+        An audio file waiting for a free transcription slot holds no pool thread, so the
+        pool keeps serving the other files' requests in the meantime.
+
+        Args:
+            categorize: Whether to categorize the files, or only load their contents
+
+        Returns:
+            The categories (or contents) in text, audio, image order, with None for failed
+            files.
+        """
+        transcription_slots = asyncio.Semaphore(MAX_TRANSCRIPTIONS)
+        transcribe = partial(self.openai_client.audio_to_text, config=AUDIO_CONFIG)
+        describe = partial(self.openai_client.image_to_text, config=IMAGE_CONFIG)
+
+        jobs = [
+            self._aprocess_media_file(audio_file, transcribe, transcription_slots, categorize)
+            for audio_file in self.files.get("mp3", [])
+        ]
+        jobs += [
+            self._aprocess_media_file(image_file, describe, categorize=categorize)
+            for image_file in self.files.get("png", [])
+        ]
         text_files = self.files.get("txt", [])
-        logging.info(f"Processing {len(text_files)} text files")
+        text_job = (
+            self._acategorize_text_files(text_files)
+            if categorize
+            else self._aload_text_files(text_files)
+        )
+        text_results, *media_results = await asyncio.gather(text_job, *jobs)
+        return [*text_results, *media_results]
+
+    async def _aload_text_files(self, text_files: list[str]) -> list[str | None]:
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(
+            *(
+                loop.run_in_executor(self.executor, self._load_text_file, text_file)
+                for text_file in text_files
+            )
+        )
 
-        for text_file in text_files:
-            logging.info(f"Processing text file: {text_file}")
-            try:
-                with open(os.path.join(self.files_dir_path, text_file), "r") as file:
-                    content = file.read()
-                    logging.info(f"Read {len(content)} characters from {text_file}")
+    async def _acategorize_text_files(self, text_files: list[str]) -> list[str | None]:
+        contents = await self._aload_text_files(text_files)
+        # categorize_contents waits on the pool itself, so it must not run on a pool thread
+        return await asyncio.to_thread(self.categorize_contents, contents)
 
-                    category = self.categorize_content(content)
+    def process_all_files_batched(self):
+        """
+        Categorizes the text, audio and image files with a single Batch API job.
 
-                    if category:
-                        self.results[category].append(text_file)
-                        logging.info(f"Added {text_file} to category: {category}")
-                    else:
-                        logging.warning(f"No category assigned to {text_file}")
+        Transcriptions and image descriptions still go through the regular API first, as
+        only the categorization requests are plain chat messages.
+        """
+        self._prepare_transcriptions()
 
-            except Exception as e:
-                logging.error(f"Error processing {text_file}: {e}")
+        filenames = self._ordered_filenames()
+        logging.info(f"Loading the contents of {len(filenames)} files")
+
+        contents = asyncio.run(self._process_all_files_async(categorize=False))
+        self._record_categories(filenames, self.categorize_batch(contents))
+        self.save_category_cache()
 
-    def process_media_files(self, file_extensions: list[str], openai_method_name: str, config):
-        # Add this at the start:
+    def _load_text_file(self, text_file: str) -> str | None:
+        """
+        Reads a text file, returning None if it could not be read.
+        """
+        try:
+            return self._read_text_file(text_file)
+        except Exception as e:
+            logging.error(f"Error processing {text_file}: {e}")
+            return None
+
+    def _read_text_file(self, text_file: str) -> str:
+        content = Path(self.files_dir_path, text_file).read_bytes().decode()
+        logging.debug("Read %d characters from %s", len(content), text_file)
+        return content
+
+    def _prepare_transcriptions(self):
         os.makedirs(self.transcriptions_path, exist_ok=True)
         logging.info(f"Ensured transcriptions directory exists: {self.transcriptions_path}")
 
-        total_files = sum(len(self.files.get(ext, [])) for ext in file_extensions)
-        logging.info(f"Processing {total_files} media files with extensions: {file_extensions}")
+        # List the saved transcriptions before the worker threads start checking them
+        self._transcription_set = set(os.listdir(self.transcriptions_path))
+
+    def _record_categories(self, filenames: list[str], categories):
+        # Categories come in input order, so they do not depend on which request
+        # finishes first
+        assigned = 0
+        for filename, category in zip(filenames, categories):
+            if category:
+                self.results[category].append(filename)
+                assigned += 1
+                logging.debug("Added %s to category: %s", filename, category)
+            else:
+                logging.warning(f"No category assigned to {filename}")
+        logging.info("Assigned a category to %d of %d files", assigned, len(filenames))
+
+    async def _aprocess_media_file(
+        self,
+        media_file: str,
+        handler: Callable[[str], str],
+        slots: asyncio.Semaphore | None = None,
+        categorize: bool = True,
+    ):
+        """
+        Transcribes a media file (or loads its saved transcription) and categorizes it.
+        New transcriptions wait for one of the given slots, if any, while saved
+        transcriptions are read right away.
+
+        Returns the category, or with categorize=False the transcription, or None if the
+        file could not be processed or categorized.
+        """
+        loop = asyncio.get_running_loop()
+
+        def run(function, *args):
+            return loop.run_in_executor(self.executor, function, *args)
+
+        try:
+            if transcription_file_path := self.check_if_transcription_exists(media_file):
+                content = await run(self._read_transcription, transcription_file_path)
+                return await run(self.categorize_content, content) if categorize else content
 
-        for ext in file_extensions:
-            files_for_ext = self.files.get(ext, [])
-            logging.info(f"Processing {len(files_for_ext)} {ext} files")
+            async with slots or nullcontext():
+                content = await run(self._transcribe, media_file, handler)
 
-            for media_file in files_for_ext:
-                logging.info(f"Processing {ext} file: {media_file}")
+            if not categorize:
+                await run(self._save_transcription, media_file, content)
+                return content
 
-                try:
-                    if transcription_file_path := self.check_if_transcription_exists(media_file):
-                        logging.info(f"Using existing transcription: {transcription_file_path}")
-                        with open(transcription_file_path, "r") as file:
-                            content = file.read()
-                            logging.info(f"Loaded existing transcription ({len(content)} chars)")
-                    else:
-                        logging.info("No existing transcription, calling OpenAI API...")
-
-                        openai_method: Callable = getattr(self.openai_client, openai_method_name)
-                        content = openai_method(
-                            os.path.join(self.files_dir_path, media_file), config
-                        )
-
-                        logging.info(f"Received transcription ({len(content)} chars), saving...")
-                        transcription_path = os.path.join(
-                            self.transcriptions_path, f"{media_file}.txt"
-                        )
-                        with open(transcription_path, "w") as file:
-                            file.write(content)
-                        logging.info(f"Saved transcription to: {transcription_path}")
-
-                    category = self.categorize_content(content)
-
-                    if category:
-                        self.results[category].append(media_file)
-                        logging.info(f"Added {media_file} to category: {category}")
-                    else:
-                        logging.warning(f"No category assigned to {media_file}")
-
-                except Exception as e:
-                    logging.error(f"Error processing {media_file}: {e}")
-
-    def process_image_files(self):
-        image_config = ChatConfig(model="gpt-4.1-mini", system_prompt=IMAGE_PROMPT)
-        self.process_media_files(["png"], "image_to_text", image_config)
-
-    def process_audio_files(self, audio_config: AudioConfig = AudioConfig(model="whisper-1")):
-        self.process_media_files(["mp3"], "audio_to_text", audio_config)
+            # Save the transcription while its categorization request is in flight
+            _, category = await asyncio.gather(
+                run(self._save_transcription, media_file, content),
+                run(self.categorize_content, content),
+            )
+            return category
+        except Exception as e:
+            logging.error(f"Error processing {media_file}: {e}")
+            return None
+
+    def _read_transcription(self, transcription_file_path: str) -> str:
+        logging.debug("Using existing transcription: %s", transcription_file_path)
+        with open(transcription_file_path, "r") as file:
+            content = file.read()
+            logging.debug("Loaded existing transcription (%d chars)", len(content))
+        return content
+
+    def _transcribe(self, media_file: str, handler: Callable[[str], str]) -> str:
+        logging.debug("No existing transcription of %s, calling OpenAI API...", media_file)
+        content = handler(os.path.join(self.files_dir_path, media_file))
+        logging.debug("Received transcription (%d chars)", len(content))
+        return content
+
+    def _save_transcription(self, media_file: str, content: str):
+        """
+        Saves a transcription for the next run. A failed save is only logged, as the
+        transcription itself is still usable.
+        """
+        transcription_filename = f"{media_file}.txt"
+        transcription_path = os.path.join(self.transcriptions_path, transcription_filename)
+
+        # Write a temporary file and swap it in, so a crash never leaves a truncated
+        # transcription that later runs would trust
+        tmp_path = f"{transcription_path}.tmp"
+        try:
+            with open(tmp_path, "w") as file:
+                file.write(content)
+            os.replace(tmp_path, transcription_path)
+        except OSError as e:
+            logging.warning(f"Failed to save transcription of {media_file}: {e}")
+            return
+
+        self._transcription_set.add(transcription_filename)
+        logging.debug("Saved transcription to: %s", transcription_path)
 
     def categorize_content(self, content: str):
-        logging.info(f"Categorizing content ({len(content)} characters)...")
+        logging.debug("Categorizing content (%d characters)...", len(content))
+
+        cache_key = self._category_cache_key(content)
 
         try:
-            response = self.openai_client.send_message(
-                content,
-                config=ChatConfig(
-                    model="gpt-4o-mini", system_prompt=CATEGORIZE_PROMPT
-                ),  # Fix model name
-            )
-            logging.debug(f"OpenAI response: {response}")  # Add this for debugging
+            if (content_category := self._category_cache.get(cache_key)) is not None:
+                logging.debug("Using cached category: %s", content_category)
+            else:
+                response = self.openai_client.send_message(content, config=CATEGORIZE_CONFIG)
+                logging.debug("OpenAI response: %s", response)
 
-            response_dict = json.loads(response)
-            content_category = response_dict.get("category", "unknown")
+                response_dict = orjson.loads(response)
+                content_category = response_dict.get("category", "unknown")
+                with self._category_cache_lock:
+                    self._category_cache[cache_key] = content_category
 
-            logging.info(f"Content categorized as: {content_category}")
+                logging.debug("Content categorized as: %s", content_category)
 
             if content_category not in self.results:
                 logging.warning(
@@ -156,7 +350,7 @@ class TaskSolver:
 
             return content_category
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logging.error(f"Failed to parse OpenAI response as JSON: {e}")
             logging.error(f"Raw response: {response}")
             return None
@@ -164,37 +358,194 @@ class TaskSolver:
             logging.error(f"Error categorizing content: {e}")
             return None
 
+    def categorize_contents(self, contents: list[str | None]) -> list[str | None]:
+        """
+        Categorizes several contents, sending as many of them in each request as fit in
+        CATEGORIZE_GROUP_MAX_CHARS. Cached categories are reused, and contents the model
+        leaves out of its answer are categorized one by one.
+
+        Returns the categories in the order of the contents, with None for contents that are
+        None, could not be categorized, or got an unknown category.
+        """
+        categories = [
+            self._category_cache.get(self._category_cache_key(content)) if content else None
+            for content in contents
+        ]
+        pending = [
+            index
+            for index, (content, category) in enumerate(zip(contents, categories))
+            if content and category is None
+        ]
+        groups = []
+        group_chars = 0
+        for index in pending:
+            # A content bigger than the limit still gets a group of its own
+            if not groups or group_chars + len(contents[index]) > CATEGORIZE_GROUP_MAX_CHARS:
+                groups.append([])
+                group_chars = 0
+            groups[-1].append(index)
+            group_chars += len(contents[index])
+        logging.info(f"Categorizing {len(pending)} contents in {len(groups)} requests")
+
+        group_categories = self.executor.map(
+            self._categorize_group, [[contents[index] for index in group] for group in groups]
+        )
+        for group, answers in zip(groups, group_categories):
+            for index, category in zip(group, answers):
+                # Contents left out of the answer get a request of their own
+                if category is None:
+                    category = self.categorize_content(contents[index])
+                categories[index] = category
+
+        return self._known_categories(categories)
+
+    def _categorize_group(self, contents: list[str]) -> list[str | None]:
+        """
+        Categorizes a group of contents with one request.
+
+        Returns the categories in the order of the contents, with None for contents missing
+        from the answer.
+        """
+        message = orjson.dumps(
+            [{"id": str(index), "text": content} for index, content in enumerate(contents)]
+        ).decode()
+
+        try:
+            response = self.openai_client.send_message(message, config=CATEGORIZE_GROUP_CONFIG)
+            logging.debug("OpenAI response: %s", response)
+            assigned = orjson.loads(response).get("categories") or {}
+        except Exception as e:
+            logging.error(f"Error categorizing a group of {len(contents)} contents: {e}")
+            return [None] * len(contents)
+
+        categories = []
+        with self._category_cache_lock:
+            for index, content in enumerate(contents):
+                category = assigned.get(str(index))
+                if not isinstance(category, str):
+                    categories.append(None)
+                    continue
+                self._category_cache[self._category_cache_key(content)] = category
+                categories.append(category)
+        return categories
+
+    def categorize_batch(self, contents: list[str | None]) -> list[str | None]:
+        """
+        Categorizes several contents with one Batch API job. Cached categories are reused
+        and only the remaining contents are submitted.
+
+        Returns the categories in the order of the contents, with None for contents that are
+        None, could not be categorized, or got an unknown category.
+        """
+        keys = [self._category_cache_key(content) if content else None for content in contents]
+        categories = [self._category_cache.get(key) if key else None for key in keys]
+
+        pending = [
+            index
+            for index, (content, category) in enumerate(zip(contents, categories))
+            if content and category is None
+        ]
+        logging.info(
+            f"Categorizing {len(pending)} contents with the Batch API, "
+            f"{len(contents) - len(pending)} cached or skipped"
+        )
+
+        if pending:
+            try:
+                batch_id = self.openai_client.submit_batch(
+                    [contents[index] for index in pending], config=CATEGORIZE_CONFIG
+                )
+                responses = self.openai_client.fetch_batch(batch_id)
+            except Exception as e:
+                logging.error(f"Error categorizing contents with the Batch API: {e}")
+                responses = [None] * len(pending)
+
+            for index, response in zip(pending, responses):
+                if response is None:
+                    continue
+                try:
+                    category = orjson.loads(response).get("category", "unknown")
+                except orjson.JSONDecodeError as e:
+                    logging.error(f"Failed to parse OpenAI response as JSON: {e}")
+                    logging.error(f"Raw response: {response}")
+                    continue
+                with self._category_cache_lock:
+                    self._category_cache[keys[index]] = category
+                categories[index] = category
+
+        return self._known_categories(categories)
+
+    def _known_categories(self, categories: list[str | None]) -> list[str | None]:
+        """
+        Replaces categories that are not one of the result categories with None.
+        """
+        known = []
+        for index, category in enumerate(categories):
+            if category is not None and category not in self.results:
+                logging.warning(f"Unknown content category '{category}' for content {index}")
+                category = None
+            known.append(category)
+        return known
+
+    @staticmethod
+    def _category_cache_key(content: str) -> str:
+        raw_key = f"{CATEGORIZE_CACHE_PREFIX}{content}"
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
     def check_if_transcription_exists(self, filename: str) -> str:
-        transcription_file_path = os.path.join(self.transcriptions_path, f"{filename}.txt")
-        if os.path.exists(transcription_file_path):
-            logging.info(f"Transcription already exists for {filename}.")
-            return transcription_file_path
+        if self._transcription_set is None:
+            self._transcription_set = set(os.listdir(self.transcriptions_path))
+
+        transcription_filename = f"{filename}.txt"
+        if transcription_filename in self._transcription_set:
+            logging.debug("Transcription already exists for %s.", filename)
+            return os.path.join(self.transcriptions_path, transcription_filename)
         return ""
 
+    def _load_category_cache(self) -> dict[str, str]:
+        try:
+            return orjson.loads(Path(self.category_cache_path).read_bytes())
+        except FileNotFoundError:
+            return {}
+        except orjson.JSONDecodeError as e:
+            logging.warning(f"Ignoring corrupted category cache {self.category_cache_path}: {e}")
+            return {}
+
+    def save_category_cache(self):
+        os.makedirs(os.path.dirname(self.category_cache_path), exist_ok=True)
+
+        # Write a temporary file and swap it in, so a crash never leaves a truncated cache
+        tmp_path = f"{self.category_cache_path}.tmp"
+        with self._category_cache_lock, open(tmp_path, "wb") as file:
+            file.write(orjson.dumps(self._category_cache))
+        os.replace(tmp_path, self.category_cache_path)
+        logging.info(f"Saved {len(self._category_cache)} cached categories")
+
     def save_results_to_json(self):
-        with open(os.path.join(self.files_dir_path, "results.json"), "w") as file:
-            json.dump(self.results, file, indent=4)
+        with open(os.path.join(self.files_dir_path, "results.json"), "wb") as file:
+            file.write(orjson.dumps(self.results, option=orjson.OPT_INDENT_2))
 
 
 def main():
-    openai_client = OpenAIClient()
+    openai_client = OpenAIClient(
+        rate_limiter=RateLimiter(OPENAI_MAX_REQUESTS_PER_MINUTE, OPENAI_MAX_TOKENS_PER_MINUTE)
+    )
     centrala_client = CentralaClient(task_identifier="kategorie")
     solver = TaskSolver(openai_client=openai_client)
 
     # 1. Read filenames and categorize them
     solver.read_files()
 
-    # 2. Read text files
-    solver.process_text_files()
-
-    # 3. Transcribe audio files with OpenAI and save to text files
-    solver.process_audio_files()
-
-    # 4. Read image files with OpenAI and save to text files
-    solver.process_image_files()
+    # 2. Categorize text files, and transcribe audio and image files with OpenAI, save the
+    #    transcriptions to text files and categorize them, all at once
+    if USE_BATCH_API:
+        solver.process_all_files_batched()
+    else:
+        solver.process_all_files()
 
-    # 5. Save results to file
+    # 3. Save results to file
     solver.save_results_to_json()
+    solver.executor.shutdown()
 
-    # 6. Send the final results
+    # 4. Send the final results
     centrala_client.send_answer(solver.results)
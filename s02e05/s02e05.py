@@ -1,15 +1,21 @@
-import json
+import hashlib
 import logging
+import orjson
 import os
 import requests
+import tempfile
 
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from typing import Callable
+from urllib3.util.retry import Retry
 
 from clients.centrala_client import CentralaClient
 from clients.local_llm_client import LocalLLMClient
 from clients.openai_client import AudioConfig, ChatConfig, OpenAIClient
 from s02e05.prompts import TASK_PROMPT
 from utils.media_extractor import MediaExtractor, MediaMatch
+from utils.rate_limiter import RateLimiter
 
 from html_to_markdown import convert_to_markdown
 
@@ -21,14 +27,41 @@ ANDRZEJ_ARTICLE_URL = "https://c3ntrala.ag3nts.org/dane/arxiv-draft.html"
 BASE_DATA_URL = "https://c3ntrala.ag3nts.org/dane"
 DOWNLOAD_DIR = "downloaded_media"
 
+# Account limits that all OpenAI requests of this task are throttled to
+OPENAI_MAX_REQUESTS_PER_MINUTE = 500
+OPENAI_MAX_TOKENS_PER_MINUTE = 200_000
+
+# Connect and read timeouts in seconds
+REQUEST_TIMEOUT = (3.05, 30)
+
+# Image descriptions and audio transcriptions are kept here between runs
+TRANSCRIPTION_CACHE_DIR = "cache"
+
+
+def _create_session() -> requests.Session:
+    """
+    Creates a session that keeps connections alive and retries transient server errors.
+
+    Returns:
+        requests.Session: Session shared by the task, article and media requests.
+    """
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    session.mount(
+        "https://", HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retries)
+    )
+    return session
+
 
 class TaskSolver:
     def __init__(self, llm_client: OpenAIClient, centrala_api_key: str):
         self.current_path = os.path.dirname(os.path.abspath(__file__))
         self.updated_article_path = os.path.join(self.current_path, "updated_article.md")
         self.download_dir = os.path.join(self.current_path, DOWNLOAD_DIR)
+        self.transcription_cache_dir = os.path.join(self.download_dir, TRANSCRIPTION_CACHE_DIR)
 
         self.llm_client = llm_client
+        self.session = _create_session()
 
         self.centrala_api_key = centrala_api_key
         self.task_url = self._task_url()
@@ -42,7 +75,7 @@ class TaskSolver:
     def get_task(self):
         logging.info("Getting task...")
 
-        task_response = requests.get(self.task_url)
+        task_response = self.session.get(self.task_url, timeout=REQUEST_TIMEOUT)
         task_response.raise_for_status()
 
         logging.info("Task content retrieved successfully.")
@@ -53,10 +86,13 @@ class TaskSolver:
     def parse_tasks(self, task_content: str):
         logging.info("Parsing tasks...")
 
-        # Iterate over the lines in the task content, each line is a task
-        for line in task_content.splitlines():
-            question_number, question_content = line.split("=", 1)
-            self.questions[question_number.strip()] = question_content.strip()
+        # Each line is a task in the "number=question" format, blank lines are skipped
+        self.questions = {
+            question_number.strip(): question_content.strip()
+            for question_number, _, question_content in (
+                line.partition("=") for line in task_content.splitlines() if line.strip()
+            )
+        }
 
         logging.info(f"Parsed {len(self.questions)} questions.")
         logging.info(f"Questions: {self.questions}")
@@ -64,7 +100,7 @@ class TaskSolver:
     def get_article(self, article_url: str):
         logging.info("Getting article...")
 
-        response = requests.get(article_url)
+        response = self.session.get(article_url, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
 
         logging.info("Article content retrieved successfully.")
@@ -84,10 +120,14 @@ class TaskSolver:
         local_file = f"{self.download_dir}/{Path(match.file_path).name}"
 
         if match.is_image:
-            image_description = self.llm_client.image_to_text(
-                image_file_path=local_file,
-                config=ChatConfig(
-                    model="gpt-4.1-mini", system_prompt="Describe the image in detail."
+            image_description = self._cached_transcription(
+                local_file,
+                "image",
+                lambda: self.llm_client.image_to_text(
+                    image_file_path=local_file,
+                    config=ChatConfig(
+                        model="gpt-4.1-mini", system_prompt="Describe the image in detail."
+                    ),
                 ),
             )
             image_description_formatted = f"""
@@ -98,8 +138,12 @@ class TaskSolver:
             """
             return image_description_formatted
         else:
-            audio_transcription = self.llm_client.audio_to_text(
-                audio_file_path=local_file, config=AudioConfig(model="whisper-1")
+            audio_transcription = self._cached_transcription(
+                local_file,
+                "audio",
+                lambda: self.llm_client.audio_to_text(
+                    audio_file_path=local_file, config=AudioConfig(model="whisper-1")
+                ),
             )
             audio_transcription_formatted = f"""
             <audio_transcription>
@@ -109,23 +153,54 @@ class TaskSolver:
                 """
             return audio_transcription_formatted
 
+    def _cached_transcription(self, local_file: str, kind: str, transcribe: Callable[[], str]):
+        """
+        Returns the saved description or transcription of a media file, keyed by its content.
+        On a miss it is created with transcribe and saved for the next run.
+        """
+        digest = hashlib.sha256(Path(local_file).read_bytes()).hexdigest()
+        cache_path = os.path.join(self.transcription_cache_dir, f"{digest}.{kind}.txt")
+
+        if os.path.exists(cache_path):
+            logging.info(f"Using cached {kind} transcription of {local_file}")
+            return Path(cache_path).read_text()
+
+        transcription = transcribe()
+
+        # Write a temporary file and swap it in, so a crash never leaves a truncated entry
+        os.makedirs(self.transcription_cache_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.transcription_cache_dir, suffix=".tmp", delete=False
+        ) as file:
+            file.write(transcription)
+        os.replace(file.name, cache_path)
+        logging.info(f"Saved {kind} transcription of {local_file}")
+
+        return transcription
+
 
 def main():
     centrala_client = CentralaClient(task_identifier=TASK_ID)
-    openai_client = OpenAIClient()
+    openai_client = OpenAIClient(
+        rate_limiter=RateLimiter(OPENAI_MAX_REQUESTS_PER_MINUTE, OPENAI_MAX_TOKENS_PER_MINUTE)
+    )
     local_llm_client = LocalLLMClient()
     solver = TaskSolver(llm_client=openai_client, centrala_api_key=centrala_client.api_key)
 
     task_content = solver.get_task()
     solver.parse_tasks(task_content)
 
-    if not os.path.exists(solver.updated_article_path):
+    if os.path.exists(solver.updated_article_path):
+        updated_article_content = Path(solver.updated_article_path).read_text()
+    else:
         logging.info("Article not found, downloading...")
         article_html = solver.get_article(ANDRZEJ_ARTICLE_URL)
         article_markdown = solver.article_to_markdown(article_html)
 
         logging.info("Extracting media from article...")
-        media_extractor = MediaExtractor(base_url=BASE_DATA_URL, download_dir=solver.download_dir)
+        media_extractor = MediaExtractor(
+            base_url=BASE_DATA_URL, download_dir=solver.download_dir, session=solver.session
+        )
         media_matches, download_mapping = media_extractor.process_text(article_markdown)
         updated_text = media_extractor.replace_media_links(
             text=article_markdown,
@@ -136,8 +211,8 @@ def main():
         logging.info("Updating article with media links...")
         with open(solver.updated_article_path, "w") as f:
             f.write(updated_text)
+        updated_article_content = updated_text
 
-    updated_article_content = open(solver.updated_article_path, "r").read()
     message = f"Questions: {solver.questions}\n\nArticle: {updated_article_content}"
     logging.info("Sending message to LLM...")
     logging.info(f"Message: {message}")
@@ -149,6 +224,6 @@ def main():
         message=message, config=ChatConfig(model="gpt-4.1-mini", system_prompt=TASK_PROMPT)
     )
 
-    answers_json = json.loads(answers)
+    answers_json = orjson.loads(answers)
 
     centrala_client.send_answer(answers_json.get("answers"))
@@ -1,12 +1,18 @@
-import json
 import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 from clients.centrala_client import CentralaClient
 from clients.llm_configs import ChatConfig
 from clients.openai_client import OpenAIClient
 from s03e01.system_prompt import SYSTEM_PROMPT
+from utils.rate_limiter import estimate_tokens
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -15,6 +21,14 @@ logger = logging.getLogger(__name__)
 # Constants
 DEFAULT_FILES_DIR = Path("/Users/mcbartop/Code/ai_devs_3/downloaded_data/pliki_z_fabryki")
 ENCODING = "utf-8"
+# Files read at once, so the reads of many small files overlap
+MAX_READ_WORKERS = 16
+
+# The system prompt never changes, so its config and token estimate are built once
+CHAT_CONFIG = ChatConfig(model="gpt-4.1-mini", system_prompt=SYSTEM_PROMPT)
+SYSTEM_PROMPT_TOKENS = estimate_tokens(SYSTEM_PROMPT)
+# OpenAI only caches prompt prefixes of at least this many tokens
+MIN_CACHED_PREFIX_TOKENS = 1024
 
 
 class TaskSolver:
@@ -29,7 +43,8 @@ class TaskSolver:
         self.files_dir_path = Path(files_dir_path)
         self._validate_directory()
 
-        self.files: dict[str, str] = {}
+        # Report files by name, read only when the reports section is rendered
+        self.files: dict[str, os.DirEntry] = {}
         self.facts: list[str] = []
 
     def _validate_directory(self) -> None:
@@ -42,25 +57,28 @@ class TaskSolver:
 
     def load_data(self) -> None:
         """Load all text files and facts from the directory."""
+        start = time.perf_counter()
+
+        # The prompt sections are rendered from the loaded data, drop any stale ones
+        self.__dict__.pop("facts_section", None)
+        self.__dict__.pop("reports_section", None)
+
         self._load_text_files()
         self._load_facts()
 
-        logger.info(f"Successfully loaded {len(self.files)} files and {len(self.facts)} facts")
+        logger.info(
+            "Successfully loaded %d files and %d facts in %.2fs",
+            len(self.files),
+            len(self.facts),
+            time.perf_counter() - start,
+        )
 
     def _load_text_files(self) -> None:
-        """Load all .txt files from the main directory."""
+        """List all .txt files of the main directory."""
         try:
-            txt_files = list(self.files_dir_path.glob("*.txt"))
-
-            for file_path in txt_files:
-                try:
-                    content = file_path.read_text(encoding=ENCODING)
-                    self.files[file_path.name] = content
-                    logger.debug(f"Loaded file: {file_path.name}")
-                except UnicodeDecodeError as e:
-                    logger.warning(f"Failed to decode file {file_path.name}: {e}")
-                except IOError as e:
-                    logger.warning(f"Failed to read file {file_path.name}: {e}")
+            for entry in self._list_text_files(self.files_dir_path):
+                self.files[entry.name] = entry
+                logger.debug("Found file: %s", entry.name)
 
         except Exception as e:
             raise Exception(f"Error loading text files: {e}") from e
@@ -78,22 +96,62 @@ class TaskSolver:
             return
 
         try:
-            fact_files = list(facts_dir.glob("*.txt"))
-
-            for file_path in fact_files:
-                try:
-                    content = file_path.read_text(encoding=ENCODING).strip()
-                    if content:  # Only add non-empty facts
-                        self.facts.append(content)
-                        logger.debug(f"Loaded fact from: {file_path.name}")
-                except UnicodeDecodeError as e:
-                    logger.warning(f"Failed to decode fact file {file_path.name}: {e}")
-                except IOError as e:
-                    logger.warning(f"Failed to read fact file {file_path.name}: {e}")
+            fact_files = self._list_text_files(facts_dir)
+
+            for entry, content in self._read_files(fact_files, "fact file"):
+                content = content.strip()
+                if content:  # Only add non-empty facts
+                    self.facts.append(content)
+                    logger.debug("Loaded fact from: %s", entry.name)
 
         except Exception as e:
             raise Exception(f"Error loading facts: {e}") from e
 
+    @staticmethod
+    def _list_text_files(directory: Path) -> list[os.DirEntry]:
+        """List the .txt files of a directory, sorted by name.
+
+        DirEntry caches the file type from the directory listing, so no file is stat'ed
+        separately. The listing order is arbitrary, sorting it keeps the prompt identical
+        between runs, so OpenAI's prompt caching can reuse its unchanged prefix.
+
+        Args:
+            directory: Directory to list
+
+        Returns:
+            Entries of the .txt files
+        """
+        with os.scandir(directory) as entries:
+            return sorted(
+                (entry for entry in entries if entry.name.endswith(".txt") and entry.is_file()),
+                key=lambda entry: entry.name,
+            )
+
+    def _read_files(self, entries: list[os.DirEntry], kind: str) -> list[tuple[os.DirEntry, str]]:
+        """Read text files concurrently, skipping the ones that cannot be read.
+
+        Args:
+            entries: Entries of the files to read
+            kind: Kind of the files, used in warnings
+
+        Returns:
+            (entry, content) pairs in the order of entries
+        """
+
+        def read(entry: os.DirEntry) -> tuple[os.DirEntry, str | None]:
+            try:
+                # Decoding the bytes directly skips the overhead of a text-mode file
+                with open(entry.path, "rb") as file:
+                    return entry, file.read().decode(ENCODING)
+            except UnicodeDecodeError as e:
+                logger.warning(f"Failed to decode {kind} {entry.name}: {e}")
+            except IOError as e:
+                logger.warning(f"Failed to read {kind} {entry.name}: {e}")
+            return entry, None
+
+        with ThreadPoolExecutor(max_workers=MAX_READ_WORKERS) as executor:
+            return [pair for pair in executor.map(read, entries) if pair[1] is not None]
+
     def build_prompt_message(self) -> str:
         """Construct the user message with facts and reports.
 
@@ -103,16 +161,28 @@ class TaskSolver:
         if not self.facts and not self.files:
             logger.warning("No facts or files loaded when building prompt message")
 
-        facts_section = "\n".join(self.facts) if self.facts else "No facts available"
-        reports_section = json.dumps(self.files, indent=2, ensure_ascii=False)
+        return (
+            f"<facts>\n{self.facts_section}\n</facts>\n\n"
+            f"<raporty>\n{self.reports_section}</raporty>"
+        )
+
+    @cached_property
+    def facts_section(self) -> str:
+        """Facts joined into the prompt's facts section, rendered once per load."""
+        return "\n".join(self.facts) if self.facts else "No facts available"
 
-        return f"""<facts>
-            {facts_section}
-            </facts>
+    @cached_property
+    def reports_section(self) -> str:
+        """Reports as one tagged block each, rendered once per load.
 
-            <raporty>
-            {reports_section}
-            </raporty>"""
+        Plain blocks keep the report text as-is, without the JSON escaping and indentation
+        that would cost input tokens. The reports are only read here, so their text is held
+        once, in the rendered section, rather than also in self.files.
+        """
+        return "".join(
+            f'<raport nazwa="{entry.name}">\n{content}\n</raport>\n'
+            for entry, content in self._read_files(list(self.files.values()), "file")
+        )
 
     def get_summary(self) -> dict[str, Any]:
         """Get a summary of loaded data.
@@ -141,7 +211,7 @@ def process_llm_response(response: str) -> dict[str, Any]:
         TaskSolverError: If response cannot be parsed or is invalid
     """
     try:
-        parsed_response = json.loads(response)
+        parsed_response = orjson.loads(response)
 
         if not isinstance(parsed_response, dict):
             raise Exception("LLM response is not a valid JSON object")
@@ -152,7 +222,7 @@ def process_llm_response(response: str) -> dict[str, Any]:
 
         return parsed_response.get("answer", {})
 
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         raise Exception(f"Failed to parse LLM response as JSON: {e}") from e
 
 
@@ -173,14 +243,20 @@ def main() -> None:
 
         # Build prompt and get LLM response
         user_message = solver.build_prompt_message()
-        logger.info("Sending message to LLM...")
-
-        logging.info(SYSTEM_PROMPT + user_message)
 
-        llm_response = openai_client.send_message(
-            message=user_message,
-            config=ChatConfig(model="gpt-4.1-mini", system_prompt=SYSTEM_PROMPT),
+        # The system prompt and facts come first and are the same on every run, so OpenAI
+        # can serve them from its prompt cache
+        prefix_tokens = SYSTEM_PROMPT_TOKENS + estimate_tokens(solver.facts_section)
+        prompt_tokens = SYSTEM_PROMPT_TOKENS + estimate_tokens(user_message)
+        logger.info(
+            f"Sending message to LLM (~{prompt_tokens} tokens, ~{prefix_tokens} in the static "
+            f"prefix)..."
         )
+        if prefix_tokens < MIN_CACHED_PREFIX_TOKENS:
+            logger.info("Static prefix is too short to be cached by OpenAI")
+        logger.debug("Prompt: %s%s", SYSTEM_PROMPT, user_message)
+
+        llm_response = openai_client.send_message(message=user_message, config=CHAT_CONFIG)
 
         # Process response
         answer = process_llm_response(llm_response)
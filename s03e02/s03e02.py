@@ -2,6 +2,8 @@ import logging
 import os
 import re
 
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
 from clients.openai_client import OpenAIClient
 from clients.qdrant_client import QdrantClient
@@ -16,7 +18,16 @@ EMBEDDING_MODEL = "text-embedding-3-small"
 EMBEDDING_DIMENSIONS = 1536
 QDRANT_HOST = "localhost"
 QDRANT_PORT = 6333
+QDRANT_GRPC_PORT = 6334
 TASK_IDENTIFIER = "wektory"
+# Reports embedded per request, chunks are embedded concurrently
+EMBEDDING_CHUNK_SIZE = 16
+# Embedding requests in flight at once
+EMBEDDING_WORKERS = 8
+# Points per upload request and worker processes uploading them to Qdrant. One process is
+# enough for a few dozen reports, more would each pay for starting up their own client
+UPLOAD_BATCH_SIZE = 256
+UPLOAD_PARALLEL = 1
 
 
 class TaskSolver:
@@ -27,7 +38,9 @@ class TaskSolver:
     def __init__(self):
         """Initialize the task solver with required clients."""
         self.openai_client = OpenAIClient()
-        self.qdrant_client = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
+        self.qdrant_client = QdrantClient(
+            host=QDRANT_HOST, port=QDRANT_PORT, grpc_port=QDRANT_GRPC_PORT
+        )
         self.centrala_client = CentralaClient(task_identifier=TASK_IDENTIFIER)
         logging.info("TaskSolver initialized successfully")
 
@@ -158,7 +171,8 @@ class TaskSolver:
             try:
                 # Create a simple filter for this specific date
                 date_filter = self.qdrant_client.create_field_filter("date", report["date"])
-                count = self.qdrant_client.count_points(COLLECTION_NAME, date_filter)
+                # An estimate could skip a missing report, so count exactly
+                count = self.qdrant_client.count_points(COLLECTION_NAME, date_filter, exact=True)
 
                 if count > 0:
                     logging.info(f"Report for date {report['date']} already exists, skipping")
@@ -196,36 +210,40 @@ class TaskSolver:
         collection_info = self.qdrant_client.get_collection_info(COLLECTION_NAME)
         start_id = collection_info["points_count"] + 1 if collection_info else 1
 
-        for i, report in enumerate(reports):
-            try:
-                logging.info(f"Processing report {i + 1}/{len(reports)}: {report['filename']}")
-
-                # Generate embedding for report content
-                embedding = self.openai_client.create_embedding(
-                    input_text=report["content"], model=EMBEDDING_MODEL
-                )
-
-                # Prepare metadata
-                metadata = {"date": report["date"], "filename": report["filename"]}
-
-                # Add point to vector database with unique ID
-                point_id = start_id + i
-                success = self.qdrant_client.add_point(
-                    collection_name=COLLECTION_NAME,
-                    point_id=point_id,
-                    vector=embedding,
-                    payload=metadata,
-                )
+        # Embed the reports in chunks, with several chunk requests in flight at once
+        contents = [report["content"] for report in reports]
+        chunks = [
+            contents[i : i + EMBEDDING_CHUNK_SIZE]
+            for i in range(0, len(contents), EMBEDDING_CHUNK_SIZE)
+        ]
 
-                if not success:
-                    logging.error(f"Failed to index report: {report['filename']}")
-                    raise Exception(f"Failed to index report: {report['filename']}")
+        def embed(chunk: list[str]) -> list[list]:
+            return self.openai_client.create_embeddings_batch(chunk, model=EMBEDDING_MODEL)
 
-                logging.info(f"Successfully indexed report: {report['filename']}")
+        try:
+            with ThreadPoolExecutor(max_workers=EMBEDDING_WORKERS) as executor:
+                # map() keeps the chunks in report order
+                embeddings = list(chain.from_iterable(executor.map(embed, chunks)))
+        except Exception as e:
+            logging.error(f"Error generating embeddings: {e}")
+            raise Exception(f"Error generating embeddings: {e}")
+
+        # Upload all points to the vector database in parallel batches, each with a unique ID
+        success = self.qdrant_client.add_points_batch(
+            collection_name=COLLECTION_NAME,
+            ids=list(range(start_id, start_id + len(reports))),
+            vectors=embeddings,
+            payloads=[
+                {"date": report["date"], "filename": report["filename"]} for report in reports
+            ],
+            batch_size=UPLOAD_BATCH_SIZE,
+            parallel=UPLOAD_PARALLEL,
+            wait=True,
+        )
 
-            except Exception as e:
-                logging.error(f"Error processing report {report['filename']}: {e}")
-                raise Exception(f"Error processing report {report['filename']}: {e}")
+        if not success:
+            logging.error(f"Failed to index {len(reports)} reports")
+            raise Exception(f"Failed to index {len(reports)} reports")
 
         logging.info(f"Successfully indexed {len(reports)} new reports")
 
@@ -256,9 +274,9 @@ class TaskSolver:
 
             # Get the most similar result
             best_match = search_results[0]
-            theft_date = best_match["payload"]["date"]
-            filename = best_match["payload"]["filename"]
-            score = best_match["score"]
+            theft_date = best_match.payload["date"]
+            filename = best_match.payload["filename"]
+            score = best_match.score
 
             logging.info(f"Found theft mention in file: {filename}")
             logging.info(f"Report date: {theft_date}")
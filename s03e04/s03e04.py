@@ -1,5 +1,6 @@
 import logging
 import requests
+from dataclasses import replace
 from clients.openai_client import OpenAIClient
 from clients.centrala_client import CentralaClient
 from clients.llm_configs import ChatConfig
@@ -64,8 +65,8 @@ class TaskSolver:
         """Extract person names and city names from text using OpenAI."""
         self.logger.info("Extracting names and cities from Barbara's note using OpenAI")
 
-        self.chat_config.system_prompt = EXTRACT_NAMES_CITIES_PROMPT
-        response = self.openai_client.send_message(text, self.chat_config)
+        config = replace(self.chat_config, system_prompt=EXTRACT_NAMES_CITIES_PROMPT)
+        response = self.openai_client.send_message(text, config)
 
         self.logger.info(f"OpenAI extraction response: {response}")
 
@@ -92,8 +93,8 @@ class TaskSolver:
         """Normalize a Polish name to nominative case without Polish characters."""
         self.logger.info(f"Normalizing name: {name}")
 
-        self.chat_config.system_prompt = NORMALIZE_NAME_PROMPT
-        normalized = self.openai_client.send_message(name, self.chat_config).strip().upper()
+        config = replace(self.chat_config, system_prompt=NORMALIZE_NAME_PROMPT)
+        normalized = self.openai_client.send_message(name, config).strip().upper()
 
         self.logger.info(f"Normalized name '{name}' to '{normalized}'")
         return normalized
@@ -102,8 +103,8 @@ class TaskSolver:
         """Normalize a Polish city name without Polish characters."""
         self.logger.info(f"Normalizing city: {city}")
 
-        self.chat_config.system_prompt = NORMALIZE_CITY_PROMPT
-        normalized = self.openai_client.send_message(city, self.chat_config).strip().upper()
+        config = replace(self.chat_config, system_prompt=NORMALIZE_CITY_PROMPT)
+        normalized = self.openai_client.send_message(city, config).strip().upper()
 
         self.logger.info(f"Normalized city '{city}' to '{normalized}'")
         return normalized
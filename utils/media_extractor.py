@@ -2,6 +2,7 @@ import re
 import os
 import requests
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass
 from typing import Callable
@@ -21,51 +22,59 @@ class MediaMatch:
 
 
 class MediaExtractor:
-    def __init__(self, base_url: str = "", download_dir: str = "downloads"):
+    # Image links ![alt](path) and file links [filename.ext](path), matched in one pass
+    MEDIA_PATTERN = re.compile(
+        r"!\[(?P<image_alt>[^\]]*)\]\((?P<image_path>[^)]+)\)"
+        r"|\[(?P<link_name>[^\]]+\.(?P<link_ext>mp3|mp4|wav|avi|mov|pdf|zip|rar|doc|docx))\]"
+        r"\((?P<link_path>[^)]+)\)"
+    )
+
+    def __init__(
+        self,
+        base_url: str = "",
+        download_dir: str = "downloads",
+        session: requests.Session | None = None,
+    ):
         self.base_url = base_url.rstrip("/")
+        # Pass the caller's session to reuse its open connections for the downloads
+        self.session = session or requests.Session()
         # Make download_dir relative to the script file location
         script_dir = Path(__file__).parent
         self.download_dir = script_dir / download_dir
         self.download_dir.mkdir(exist_ok=True)
 
-        # Regex patterns for different media types
-        self.image_pattern = r"!\[([^\]]*)\]\(([^)]+)\)"
-        self.link_pattern = r"\[([^\]]+\.(mp3|mp4|wav|avi|mov|pdf|zip|rar|doc|docx))\]\(([^)]+)\)"
-
     def find_media_links(self, text: str) -> list[MediaMatch]:
-        """Find all media links in the text and return their positions"""
+        """Find all media links in the text and return them in order of position"""
         matches = []
 
-        # Find image links: ![alt](path)
-        for match in re.finditer(self.image_pattern, text):
-            matches.append(
-                MediaMatch(
-                    start=match.start(),
-                    end=match.end(),
-                    full_match=match.group(0),
-                    file_path=match.group(2),
-                    alt_text=match.group(1),
-                    is_image=True,
-                    extension=match.group(2).split(".")[-1],
+        # One scan finds both kinds of links, already in order and never overlapping
+        for match in self.MEDIA_PATTERN.finditer(text):
+            if (image_path := match["image_path"]) is not None:
+                matches.append(
+                    MediaMatch(
+                        start=match.start(),
+                        end=match.end(),
+                        full_match=match.group(0),
+                        file_path=image_path,
+                        alt_text=match["image_alt"],
+                        is_image=True,
+                        extension=image_path.split(".")[-1],
+                    )
                 )
-            )
-
-        # Find file links: [filename.ext](path)
-        for match in re.finditer(self.link_pattern, text):
-            matches.append(
-                MediaMatch(
-                    start=match.start(),
-                    end=match.end(),
-                    full_match=match.group(0),
-                    file_path=match.group(3),
-                    alt_text=match.group(1),
-                    is_image=False,
-                    extension=match.group(2).split(".")[-1],
+            else:
+                matches.append(
+                    MediaMatch(
+                        start=match.start(),
+                        end=match.end(),
+                        full_match=match.group(0),
+                        file_path=match["link_path"],
+                        alt_text=match["link_name"],
+                        is_image=False,
+                        extension=match["link_ext"],
+                    )
                 )
-            )
 
-        # Sort by position to maintain order
-        return sorted(matches, key=lambda x: x.start)
+        return matches
 
     def download_media(self, media_match: MediaMatch) -> str | None:
         """Download media file if it doesn't exist, return local path"""
@@ -92,7 +101,7 @@ class MediaExtractor:
 
         try:
             logging.info(f"Downloading: {url}")
-            response = requests.get(url, stream=True, timeout=30)
+            response = self.session.get(url, stream=True, timeout=30)
             response.raise_for_status()
 
             with open(local_path, "wb") as f:
@@ -122,23 +131,40 @@ class MediaExtractor:
         return media_matches, download_mapping
 
     def replace_media_links(
-        self, text: str, media_matches: list[MediaMatch], replacement_func: Callable | None = None
+        self,
+        text: str,
+        media_matches: list[MediaMatch],
+        replacement_func: Callable | None = None,
+        max_workers: int = 8,
     ) -> str:
         """
         Replace media links in text using a custom replacement function.
-        replacement_func should take (MediaMatch, local_path) and return new text.
+        replacement_func should take a MediaMatch and return new text. It is called for up
+        to max_workers matches at once, as it usually waits on an API.
         """
 
         if not replacement_func:
             replacement_func = self.replace_with_local_path
 
-        # Process matches in reverse order to maintain positions
-        result = text
-        for match in reversed(media_matches):
-            new_text = replacement_func(match)
-            result = result[: match.start] + new_text + result[match.end :]
-
-        return result
+        # Matches are sorted by position; drop any that overlap the previous one
+        kept_matches = []
+        for match in media_matches:
+            if not kept_matches or match.start >= kept_matches[-1].end:
+                kept_matches.append(match)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            replacements = list(executor.map(replacement_func, kept_matches))
+
+        # Rebuild the text in one pass instead of copying it once per match
+        parts = []
+        position = 0
+        for match, new_text in zip(kept_matches, replacements):
+            parts.append(text[position : match.start])
+            parts.append(new_text)
+            position = match.end
+        parts.append(text[position:])
+
+        return "".join(parts)
 
     @classmethod
     def replace_with_local_path(cls, match: MediaMatch) -> str:
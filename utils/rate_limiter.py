@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import time
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Roughly estimates the number of tokens in a text, at about four characters per token.
+
+    Args:
+        text (str): The text to estimate.
+
+    Returns:
+        int: The estimated token count.
+    """
+    return len(text) // 4 + 1
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter for requests per minute and tokens per minute.
+
+    Both buckets start full and refill continuously at their per-minute rate, so
+    bursts up to the limit go through immediately and sustained load is spread
+    evenly over time.
+
+    One limiter can be shared by coroutines (`acquire`) and threads (`wait`).
+    """
+
+    def __init__(self, max_requests_per_minute: float, max_tokens_per_minute: float):
+        """
+        Initializes the limiter with full buckets.
+
+        Args:
+            max_requests_per_minute (float): Maximum number of requests per minute.
+            max_tokens_per_minute (float): Maximum number of tokens per minute.
+        """
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self.available_requests = float(max_requests_per_minute)
+        self.available_tokens = float(max_tokens_per_minute)
+        self._last_update = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """Adds the capacity regained since the last update to both buckets."""
+        now = time.monotonic()
+        elapsed_minutes = (now - self._last_update) / 60
+        self._last_update = now
+
+        self.available_requests = min(
+            self.max_requests_per_minute,
+            self.available_requests + elapsed_minutes * self.max_requests_per_minute,
+        )
+        self.available_tokens = min(
+            self.max_tokens_per_minute,
+            self.available_tokens + elapsed_minutes * self.max_tokens_per_minute,
+        )
+
+    def _try_take(self, tokens: float) -> float:
+        """
+        Takes capacity for one request if both buckets have enough.
+
+        Check and take happen under a lock, so concurrent callers never overdraw the buckets.
+
+        Args:
+            tokens (float): The number of tokens the request is expected to use.
+
+        Returns:
+            float: 0 if the capacity was taken, otherwise the seconds to wait before retrying.
+        """
+        with self._lock:
+            self._refill()
+            if self.available_requests >= 1 and self.available_tokens >= tokens:
+                self.available_requests -= 1
+                self.available_tokens -= tokens
+                return 0
+
+            # Wait until the scarcer bucket has refilled enough
+            wait_minutes = max(
+                (1 - self.available_requests) / self.max_requests_per_minute,
+                (tokens - self.available_tokens) / self.max_tokens_per_minute,
+            )
+            return max(wait_minutes * 60, 0.01)
+
+    async def acquire(self, tokens: int = 0):
+        """
+        Waits until there is capacity for one request of the given size, then takes it.
+
+        Args:
+            tokens (int, optional): The number of tokens the request is expected to use.
+        """
+        # A request bigger than the whole bucket would otherwise wait forever
+        tokens = min(tokens, self.max_tokens_per_minute)
+
+        while delay := self._try_take(tokens):
+            await asyncio.sleep(delay)
+
+    def wait(self, tokens: int = 0):
+        """
+        Blocks the calling thread until there is capacity for one request of the given
+        size, then takes it. The synchronous counterpart of `acquire`.
+
+        Args:
+            tokens (int, optional): The number of tokens the request is expected to use.
+        """
+        tokens = min(tokens, self.max_tokens_per_minute)
+
+        while delay := self._try_take(tokens):
+            time.sleep(delay)